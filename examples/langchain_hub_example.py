@@ -1,7 +1,7 @@
 import asyncio
 from openaspen import OpenAspenTree
 from openaspen.llm.providers import create_llm_config
-from openaspen.integrations.langchain_hub import LangChainHubLoader, load_hub_tools
+from openaspen.integrations.langchain_hub import LangChainHubLoader, load_hub_tools_async
 
 
 async def example_basic_hub_integration():
@@ -186,9 +186,9 @@ async def example_load_tools_compatibility():
     print("Example 6: LangChain load_tools() Compatibility")
     print("=" * 60)
 
-    tools = load_hub_tools(["duckduckgo_search", "wikipedia"])
+    tools = await load_hub_tools_async(["duckduckgo_search", "wikipedia"])
 
-    print(f"✅ Loaded {len(tools)} tools using load_hub_tools()")
+    print(f"✅ Loaded {len(tools)} tools using load_hub_tools_async()")
     for tool in tools:
         print(f"  • {tool.__class__.__name__}")
 
@@ -5,6 +5,7 @@ FastAPI server with Telegram + WhatsApp webhook endpoints
 """
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 import uvicorn
@@ -21,10 +22,20 @@ load_dotenv()
 def create_messaging_app() -> FastAPI:
     """Create FastAPI app with messaging integration"""
     
+    gateway = None
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # Release the pooled HTTP session shared by the bots
+        if gateway is not None:
+            await gateway.close()
+    
     app = FastAPI(
         title="OpenAspen Messaging Server",
         description="24/7 AI agent tree accessible via Telegram and WhatsApp",
-        version="0.1.0"
+        version="0.1.0",
+        lifespan=lifespan,
     )
     
     # Create LLM configs
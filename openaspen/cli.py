@@ -128,10 +128,10 @@ def grow_leaf(
         from openaspen.integrations.langchain_hub import LangChainHubLoader
 
         click.echo("🔧 Available LangChain Hub Tools:\n")
-        for name, info in LangChainHubLoader.AVAILABLE_TOOLS.items():
-            api_key_info = f" (requires {info['requires_api_key']})" if info["requires_api_key"] else ""
+        for name, spec in LangChainHubLoader.AVAILABLE_TOOLS.items():
+            api_key_info = f" (requires {spec.requires_api_key})" if spec.requires_api_key else ""
             click.echo(f"  • {name}{api_key_info}")
-            click.echo(f"    {info['description']}")
+            click.echo(f"    {spec.description}")
         return
 
     if not hub:
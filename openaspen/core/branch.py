@@ -1,7 +1,7 @@
 from typing import Any, Optional, List, Dict, Callable
 from openaspen.core.node import TreeNode
 from openaspen.core.leaf import Leaf
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +12,9 @@ class Branch(TreeNode):
     system_prompt: str = ""
     temperature: float = 0.7
     max_tokens: int = 2000
+    # Filtered views of children, rebuilt after the children change
+    _leaves: Optional[List[Leaf]] = PrivateAttr(default=None)
+    _branches: Optional[List["Branch"]] = PrivateAttr(default=None)
 
     def __init__(
         self,
@@ -45,11 +48,19 @@ class Branch(TreeNode):
         self.add_child(leaf)
         return leaf
 
+    def _children_changed(self) -> None:
+        self._leaves = None
+        self._branches = None
+
     def get_leaves(self) -> List[Leaf]:
-        return [child for child in self.children if isinstance(child, Leaf)]
+        if self._leaves is None:
+            self._leaves = [child for child in self.children if isinstance(child, Leaf)]
+        return list(self._leaves)
 
     def get_branches(self) -> List["Branch"]:
-        return [child for child in self.children if isinstance(child, Branch)]
+        if self._branches is None:
+            self._branches = [child for child in self.children if isinstance(child, Branch)]
+        return list(self._branches)
 
     async def execute(self, input_data: Any, **kwargs: Any) -> Any:
         rag_db = kwargs.get("rag_db")
@@ -1,6 +1,6 @@
 from typing import Any, Callable, Optional, Dict, Awaitable
 from openaspen.core.node import TreeNode
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 import asyncio
 import inspect
 
@@ -10,6 +10,8 @@ class Leaf(TreeNode):
     tool_func: Optional[Callable[..., Any]] = Field(default=None, exclude=True)
     is_async: bool = False
     parameters: Dict[str, Any] = Field(default_factory=dict)
+    # "Parameters: ..." line of the embedding text, built once from the signature
+    _parameters_text: str = PrivateAttr(default="")
 
     class Config:
         arbitrary_types_allowed = True
@@ -43,6 +45,12 @@ class Leaf(TreeNode):
                 param_info["default"] = param.default
             self.parameters[param_name] = param_info
 
+        if self.parameters:
+            params_str = ", ".join(
+                f"{name}: {info.get('type', 'Any')}" for name, info in self.parameters.items()
+            )
+            self._parameters_text = f"Parameters: {params_str}"
+
     async def execute(self, input_data: Any, **kwargs: Any) -> Any:
         if self.tool_func is None:
             raise ValueError(f"Leaf '{self.name}' has no tool function defined")
@@ -67,18 +75,13 @@ class Leaf(TreeNode):
                 "path": "/".join(self.get_path()),
             }
 
-    def get_embedding_text(self) -> str:
-        text_parts = [
-            f"Skill: {self.name}",
-            f"Description: {self.description}",
-            f"Path: {'/'.join(self.get_path())}",
-        ]
-        if self.parameters:
-            params_str = ", ".join(
-                f"{name}: {info.get('type', 'Any')}" for name, info in self.parameters.items()
-            )
-            text_parts.append(f"Parameters: {params_str}")
-        return "\n".join(text_parts)
+    def get_embedding_text(self, path: Optional[str] = None) -> str:
+        if path is None:
+            path = "/".join(self.get_path())
+        text = f"Skill: {self.name}\nDescription: {self.description}\nPath: {path}"
+        if self._parameters_text:
+            text += "\n" + self._parameters_text
+        return text
 
     def to_dict(self) -> Dict[str, Any]:
         base_dict = super().to_dict()
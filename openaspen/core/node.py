@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Any, Optional, List, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 import uuid
 
 
@@ -12,50 +12,89 @@ class TreeNode(ABC, BaseModel):
     llm_provider: Optional[str] = None
     rag_context: Dict[str, Any] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    # Cached get_depth(); a cached node always has cached ancestors, so an uncached
+    # node's whole subtree is uncached too
+    _depth: Optional[int] = PrivateAttr(default=None)
+    # First child per name, kept in step with children by add_child/remove_child
+    _child_index: Dict[str, "TreeNode"] = PrivateAttr(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
 
+    # Field-wise equality would follow parent and children links through the whole
+    # tree; a node is only ever equal to itself, so compare and hash by identity
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
     @abstractmethod
     async def execute(self, input_data: Any, **kwargs: Any) -> Any:
         pass
 
     def add_child(self, child: "TreeNode") -> "TreeNode":
         child.parent = self
+        child._invalidate_depth()
         self.children.append(child)
+        self._child_index.setdefault(child.name, child)
+        self._children_changed()
         return child
 
     def remove_child(self, child: "TreeNode") -> None:
         if child in self.children:
             self.children.remove(child)
             child.parent = None
+            child._invalidate_depth()
+            if self._child_index.get(child.name) is child:
+                del self._child_index[child.name]
+                replacement = next((c for c in self.children if c.name == child.name), None)
+                if replacement is not None:
+                    self._child_index[child.name] = replacement
+            self._children_changed()
+
+    def _children_changed(self) -> None:
+        # Hook for subclasses that cache views of their children
+        pass
+
+    def _invalidate_depth(self) -> None:
+        stack: List[TreeNode] = [self]
+        while stack:
+            node = stack.pop()
+            if node._depth is None:
+                continue
+            node._depth = None
+            stack.extend(node.children)
 
     def get_path(self) -> List[str]:
         path = []
         current: Optional[TreeNode] = self
         while current is not None:
-            path.insert(0, current.name)
+            path.append(current.name)
             current = current.parent
+        path.reverse()
         return path
 
     def get_depth(self) -> int:
-        depth = 0
-        current: Optional[TreeNode] = self.parent
-        while current is not None:
-            depth += 1
+        if self._depth is not None:
+            return self._depth
+
+        # Walk up to the nearest cached ancestor (or the root), then fill in depths on the way back down
+        uncached: List[TreeNode] = []
+        current: Optional[TreeNode] = self
+        while current is not None and current._depth is None:
+            uncached.append(current)
             current = current.parent
+        depth = current._depth if current is not None else -1
+        for node in reversed(uncached):
+            depth += 1
+            node._depth = depth
         return depth
 
     def find_child(self, name: str) -> Optional["TreeNode"]:
-        for child in self.children:
-            if child.name == name:
-                return child
-        return None
+        return self._child_index.get(name)
 
     def get_siblings(self) -> List["TreeNode"]:
         if self.parent is None:
             return []
-        return [child for child in self.parent.children if child.id != self.id]
+        return [child for child in self.parent.children if child is not self]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
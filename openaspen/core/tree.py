@@ -1,12 +1,17 @@
-from typing import Dict, Any, Optional, List, Callable
+from typing import Deque, Dict, Any, Optional, List, Callable, Tuple
+from collections import deque
+from itertools import islice
 from openaspen.core.branch import Branch
 from openaspen.core.leaf import Leaf
 from openaspen.llm.router import LLMRouter
 from openaspen.llm.providers import LLMConfig
 from openaspen.rag.store import GroupRAGStore
 from openaspen.rag.embeddings import EmbeddingManager
+from openaspen.rag.cache import SemanticResponseCache
+import asyncio
 import logging
 import json
+import os
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -20,6 +25,8 @@ class OpenAspenTree:
         embedding_manager: Optional[EmbeddingManager] = None,
         name: str = "OpenAspenTree",
         use_embeddings: bool = True,
+        response_cache_threshold: Optional[float] = None,
+        history_max: int = 10_000,
     ):
         self.name = name
         self.llm_router = LLMRouter(llm_configs)
@@ -35,7 +42,27 @@ class OpenAspenTree:
             self.shared_rag_db = None
             
         self.branches: List[Branch] = []
-        self._execution_history: List[Dict[str, Any]] = []
+        # Leaves spawned in the same loop iteration are embedded together by one background task
+        self._unindexed: List[Tuple[Leaf, str]] = []
+        self._index_task: Optional["asyncio.Task[None]"] = None
+        # Bounded so long-running services do not grow the history without limit
+        self._execution_history: Deque[Dict[str, Any]] = deque(maxlen=history_max)
+
+        # OPENASPEN_WARMUP=1 starts warmup() as soon as the tree is built inside a running
+        # loop, so model loading and connection setup overlap with the rest of startup
+        self._warmup_task: Optional["asyncio.Task[None]"] = None
+        if os.getenv("OPENASPEN_WARMUP") == "1":
+            try:
+                self._warmup_task = asyncio.get_running_loop().create_task(self.warmup())
+            except RuntimeError:
+                logger.debug("No running event loop; call warmup() explicitly")
+
+        # Opt-in: a query close enough to an earlier one returns that result without re-running a branch
+        self.response_cache: Optional[SemanticResponseCache] = None
+        if response_cache_threshold is not None and self.embedding_manager is not None:
+            self.response_cache = SemanticResponseCache(
+                self.embedding_manager, threshold=response_cache_threshold
+            )
 
     def add_branch(
         self,
@@ -66,20 +93,63 @@ class OpenAspenTree:
         llm_provider: Optional[str] = None,
     ) -> Leaf:
         leaf = branch.add_leaf(skill_name, tool_func, description, llm_provider)
-        await self.shared_rag_db.index_leaf(leaf, branch.name)
+        if self.shared_rag_db is not None:
+            self._unindexed.append((leaf, branch.name))
+            if self._index_task is None or self._index_task.done():
+                self._index_task = asyncio.get_running_loop().create_task(self._index_spawned())
         logger.info(f"Spawned leaf: {skill_name} on branch: {branch.name}")
         return leaf
 
+    async def _index_spawned(self) -> None:
+        # Drain until empty so leaves spawned while a batch is embedding are not left behind
+        while self._unindexed:
+            batch, self._unindexed = self._unindexed, []
+            try:
+                await self.shared_rag_db.index_leaves(batch)
+            except Exception as e:
+                logger.warning(f"Failed to index {len(batch)} spawned leaves: {e}")
+
+    async def wait_indexed(self) -> None:
+        if self._index_task is not None:
+            await asyncio.shield(self._index_task)
+
     async def index_tree(self) -> None:
+        await self.wait_indexed()
         logger.info("Indexing entire tree in RAG database...")
-        for branch in self.branches:
-            await self.shared_rag_db.index_branch(branch)
+        await self.shared_rag_db.index_branches(self.branches)
         logger.info("Tree indexing complete")
 
+    async def warmup(self) -> None:
+        # Embedding one text loads lazily initialized models; the router opens provider connections
+        tasks = [self.llm_router.warmup()]
+        if self.embedding_manager is not None:
+            tasks.append(self.embedding_manager.get_embeddings().aembed_query("warmup"))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Warmup step failed: {result}")
+        logger.info("Tree warmup complete")
+
     async def execute(self, query: str, **kwargs: Any) -> Dict[str, Any]:
         logger.info(f"Executing query: {query}")
 
+        if self._warmup_task is not None:
+            # The first query waits for warmup instead of racing it for the same resources
+            await asyncio.shield(self._warmup_task)
+            self._warmup_task = None
+        # Branch routing and leaf selection search the store, so spawned leaves must be in it
+        await self.wait_indexed()
+
+        # Extra kwargs can change the outcome, so only plain queries use the cache
+        use_cache = self.response_cache is not None and not kwargs
+
         try:
+            if use_cache:
+                cached = await self.response_cache.get(query)
+                if cached is not None:
+                    self._execution_history.append({**cached, "query": query, "cache": True})
+                    return cached["result"]
+
             best_branch = await self._find_best_branch(query)
 
             if best_branch is None:
@@ -103,6 +173,11 @@ class OpenAspenTree:
             }
             self._execution_history.append(execution_record)
 
+            # Failures are not cached so the next identical query retries
+            failed = isinstance(result, dict) and result.get("success") is False
+            if use_cache and not failed:
+                await self.response_cache.set(query, {"branch": best_branch.name, "result": result})
+
             return result
 
         except Exception as e:
@@ -150,7 +225,10 @@ class OpenAspenTree:
         return False
 
     def get_execution_history(self, limit: int = 10) -> List[Dict[str, Any]]:
-        return self._execution_history[-limit:]
+        # Walk back from the newest entry only as far as needed, then restore oldest-first order
+        history = list(islice(reversed(self._execution_history), limit))
+        history.reverse()
+        return history
 
     def clear_history(self) -> None:
         self._execution_history.clear()
@@ -208,4 +286,5 @@ class OpenAspenTree:
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.wait_indexed()
         self.shared_rag_db.persist()
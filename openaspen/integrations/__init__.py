@@ -3,11 +3,18 @@ OpenAspen Integrations
 - Messaging: Telegram and WhatsApp bots for 24/7 mobile access
 - LangChain Hub: 100+ pre-built tools for instant skills
 """
-from openaspen.integrations.langchain_hub import LangChainHubLoader, load_hub_tools
+from openaspen.integrations.langchain_hub import (
+    LangChainHubLoader,
+    ToolSpec,
+    load_hub_tools,
+    load_hub_tools_async,
+)
 
 __all__ = [
     "LangChainHubLoader",
+    "ToolSpec",
     "load_hub_tools",
+    "load_hub_tools_async",
 ]
 
 try:
@@ -0,0 +1,36 @@
+"""
+Shared HTTP session for messaging integrations
+One pooled aiohttp session per event loop, reused by every bot
+"""
+import asyncio
+from weakref import WeakKeyDictionary
+
+import aiohttp
+
+_sessions: "WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = WeakKeyDictionary()
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Get the running loop's pooled session, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30, connect=10),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_shared_session():
+    """Close the running loop's pooled session, if one was created"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
@@ -6,6 +6,7 @@ from enum import Enum
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 from datetime import datetime
+import sys
 
 
 class MessagePlatform(str, Enum):
@@ -124,7 +125,7 @@ class CommandParser:
             args_text = text
         
         return {
-            "command": command,
+            "command": sys.intern(command),
             "raw_command": command_text,
             "args": args_text,
             "is_command": command_text.startswith("/")
@@ -0,0 +1,138 @@
+"""
+Outbound message batching for messaging integrations
+Coalesces consecutive messages to the same chat into fewer API calls
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MAX_CHARS = 4096
+WHATSAPP_MAX_CHARS = 4096
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """Split text into chunks of at most max_chars, preferring paragraph then line breaks"""
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    remaining = text
+    while len(remaining) > max_chars:
+        window = remaining[:max_chars]
+        cut = window.rfind("\n\n")
+        if cut <= 0:
+            cut = window.rfind("\n")
+        if cut <= 0:
+            cut = window.rfind(" ")
+        if cut <= 0:
+            cut = max_chars
+        chunks.append(remaining[:cut])
+        remaining = remaining[cut:].lstrip("\n")
+
+    if remaining:
+        chunks.append(remaining)
+    return chunks
+
+
+class BatchingSender:
+    """Buffer outgoing texts per chat and flush them as combined messages
+
+    Texts are buffered under an arbitrary hashable key (usually the chat id) and
+    sent by a background task every ``flush_interval`` seconds. A buffer that
+    reaches ``max_buffer_size`` entries or ``max_chars`` characters is flushed
+    immediately. Combined payloads never exceed ``max_chars``.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Hashable, str], Awaitable[bool]],
+        flush_interval: float = 3.0,
+        max_chars: int = TELEGRAM_MAX_CHARS,
+        max_buffer_size: int = 50,
+        separator: str = "\n\n",
+    ):
+        self._send = send
+        self.flush_interval = flush_interval
+        self.max_chars = max_chars
+        self.max_buffer_size = max_buffer_size
+        self.separator = separator
+        self._buffers: Dict[Hashable, List[str]] = {}
+        self._buffered_chars: Dict[Hashable, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._overflow_flushes: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the periodic flush task (requires a running event loop)"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and send whatever is still buffered"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def enqueue(self, key: Hashable, text: str) -> None:
+        """Buffer text for key, flushing early if the buffer overflows"""
+        self.start()
+
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(text)
+        chars = self._buffered_chars.get(key, 0) + len(text) + len(self.separator)
+        self._buffered_chars[key] = chars
+
+        if len(buffer) >= self.max_buffer_size or chars >= self.max_chars:
+            task = asyncio.create_task(self.flush(key))
+            self._overflow_flushes.add(task)
+            task.add_done_callback(self._overflow_flushes.discard)
+
+    async def flush(self, key: Optional[Hashable] = None) -> bool:
+        """Send buffered texts for key (or every key); returns False if any send failed"""
+        async with self._flush_lock:
+            keys = [key] if key is not None else list(self._buffers)
+            success = True
+            for k in keys:
+                texts = self._buffers.pop(k, None)
+                self._buffered_chars.pop(k, None)
+                if not texts:
+                    continue
+                for payload in self._pack(texts):
+                    try:
+                        sent = await self._send(k, payload)
+                    except Exception:
+                        logger.exception("Error flushing batched message for %s", k)
+                        sent = False
+                    success = success and bool(sent)
+            return success
+
+    def _pack(self, texts: List[str]) -> List[str]:
+        """Join texts into as few payloads of at most max_chars as possible"""
+        payloads = []
+        current: List[str] = []
+        size = 0
+        for text in texts:
+            for piece in split_text(text, self.max_chars):
+                added = len(piece) + (len(self.separator) if current else 0)
+                if current and size + added > self.max_chars:
+                    payloads.append(self.separator.join(current))
+                    current = []
+                    size = 0
+                    added = len(piece)
+                current.append(piece)
+                size += added
+        if current:
+            payloads.append(self.separator.join(current))
+        return payloads
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
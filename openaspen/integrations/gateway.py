@@ -7,6 +7,8 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 import sqlite3
 import asyncio
+import threading
+import sys
 
 from openaspen.integrations.base import (
     MessagePlatform,
@@ -15,61 +17,71 @@ from openaspen.integrations.base import (
     CommandParser,
     UserSession,
 )
+from openaspen.integrations._http import close_shared_session
 from openaspen.integrations.telegram import TelegramBot
 from openaspen.integrations.whatsapp import WhatsAppBot
 
 logger = logging.getLogger(__name__)
 
+# Commands routed to _handle_specialized_task
+_SPECIAL_TASKS: frozenset[str] = frozenset(
+    map(sys.intern, ("crypto_task", "social_task", "content_task"))
+)
+
 
 class UserDatabase:
-    """Simple SQLite database for user sessions and API key mapping"""
+    """Simple SQLite database for user sessions and API key mapping
+
+    A single connection is shared across threads so callers on the event loop
+    can offload queries with ``asyncio.to_thread``; access is serialized with a
+    lock. This is the interim arrangement until the async connection pool lands.
+    """
     
     def __init__(self, db_path: str = "users.db"):
         self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._init_db()
     
     def _init_db(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                user_id TEXT PRIMARY KEY,
-                chat_id TEXT NOT NULL,
-                platform TEXT NOT NULL,
-                api_key TEXT,
-                username TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sessions (
-                session_id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                current_task TEXT,
-                preferences TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id TEXT PRIMARY KEY,
+                    chat_id TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    api_key TEXT,
+                    username TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    current_task TEXT,
+                    preferences TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id)
+                )
+            """)
+            
+            self._conn.commit()
     
     def get_user(self, user_id: str, platform: str) -> Optional[Dict[str, Any]]:
         """Get user by ID and platform"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT * FROM users WHERE user_id = ? AND platform = ?",
-            (user_id, platform)
-        )
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(
+                "SELECT * FROM users WHERE user_id = ? AND platform = ?",
+                (user_id, platform)
+            )
+            row = cursor.fetchone()
         
         if row:
             return {
@@ -86,21 +98,23 @@ class UserDatabase:
     def create_or_update_user(self, user_id: str, chat_id: str, platform: str, 
                               username: Optional[str] = None, api_key: Optional[str] = None):
         """Create or update user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO users (user_id, chat_id, platform, username, api_key, last_activity)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET
-                chat_id = excluded.chat_id,
-                username = excluded.username,
-                api_key = COALESCE(excluded.api_key, api_key),
-                last_activity = excluded.last_activity
-        """, (user_id, chat_id, platform, username, api_key, datetime.now()))
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("""
+                INSERT INTO users (user_id, chat_id, platform, username, api_key, last_activity)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    chat_id = excluded.chat_id,
+                    username = excluded.username,
+                    api_key = COALESCE(excluded.api_key, api_key),
+                    last_activity = excluded.last_activity
+            """, (user_id, chat_id, platform, username, api_key, datetime.now()))
+            self._conn.commit()
+    
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            self._conn.close()
 
 
 class MessageGateway:
@@ -111,17 +125,23 @@ class MessageGateway:
         self.db = UserDatabase(db_path)
         self.handlers: Dict[MessagePlatform, Any] = {}
         self.command_parser = CommandParser()
+        self._command_table = {
+            "start": self._handle_start,
+            "help": self._handle_help,
+            "show_tree": self._handle_show_tree,
+            "check_status": self._handle_status,
+        }
     
-    def register_telegram(self, token: str) -> TelegramBot:
+    def register_telegram(self, token: str, **kwargs) -> TelegramBot:
         """Register Telegram bot handler"""
-        bot = TelegramBot(token, self.tree_executor)
+        bot = TelegramBot(token, self.tree_executor, **kwargs)
         self.handlers[MessagePlatform.TELEGRAM] = bot
         logger.info("Telegram bot registered")
         return bot
     
-    def register_whatsapp(self, token: str, phone_number_id: str) -> WhatsAppBot:
+    def register_whatsapp(self, token: str, phone_number_id: str, **kwargs) -> WhatsAppBot:
         """Register WhatsApp bot handler"""
-        bot = WhatsAppBot(token, phone_number_id, self.tree_executor)
+        bot = WhatsAppBot(token, phone_number_id, self.tree_executor, **kwargs)
         self.handlers[MessagePlatform.WHATSAPP] = bot
         logger.info("WhatsApp bot registered")
         return bot
@@ -129,16 +149,17 @@ class MessageGateway:
     async def handle_message(self, platform: MessagePlatform, message: IncomingMessage) -> bool:
         """Handle incoming message from any platform"""
         try:
-            # Get or create user
-            user = self.db.get_user(message.user_id, platform.value)
+            # Get or create user (sqlite calls run off the event loop)
+            user = await asyncio.to_thread(self.db.get_user, message.user_id, platform.value)
             if not user:
-                self.db.create_or_update_user(
+                await asyncio.to_thread(
+                    self.db.create_or_update_user,
                     message.user_id,
                     message.chat_id,
                     platform.value,
                     message.username
                 )
-                user = self.db.get_user(message.user_id, platform.value)
+                user = await asyncio.to_thread(self.db.get_user, message.user_id, platform.value)
             
             # Parse command
             parsed = self.command_parser.parse(message.text)
@@ -146,17 +167,12 @@ class MessageGateway:
             args = parsed["args"]
             
             # Route to appropriate handler
-            if command == "start":
-                response = await self._handle_start(message, user)
-            elif command == "help":
-                response = await self._handle_help(message, user)
-            elif command == "show_tree":
-                response = await self._handle_show_tree(message, user)
-            elif command == "check_status":
-                response = await self._handle_status(message, user)
+            handler = self._command_table.get(command)
+            if handler is not None:
+                response = await handler(message, user)
             elif command == "execute_task":
                 response = await self._handle_execute(message, user, args)
-            elif command in ["crypto_task", "social_task", "content_task"]:
+            elif command in _SPECIAL_TASKS:
                 response = await self._handle_specialized_task(message, user, command, args)
             else:
                 response = await self._handle_execute(message, user, message.text)
@@ -166,11 +182,11 @@ class MessageGateway:
             return True
             
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.exception("Error handling message")
             await self.send_message(
                 platform,
                 message.chat_id,
-                f"❌ Error processing your message: {str(e)}"
+                f"❌ Error processing your message: {e}"
             )
             return False
     
@@ -225,15 +241,15 @@ Use /execute to interact!
         
         try:
             branches = getattr(self.tree_executor, 'branches', [])
-            tree_text = "🌲 **OpenAspen Tree**\n\n📁 **Branches:**\n"
+            parts = ["🌲 **OpenAspen Tree**\n\n📁 **Branches:**\n"]
             
             for branch in branches:
-                tree_text += f"├─ 🤖 {branch.name}\n"
-                leaves = getattr(branch, 'leaves', [])
+                parts.append(f"├─ 🤖 {branch.name}\n")
+                leaves = getattr(branch, 'leaves', ())
                 for leaf in leaves:
-                    tree_text += f"│  ├─ 🍃 {leaf.name}\n"
+                    parts.append(f"│  ├─ 🍃 {leaf.name}\n")
             
-            return tree_text
+            return "".join(parts)
         except Exception as e:
             return f"🌲 **OpenAspen Tree**\n\n⚠️ Error: {str(e)}"
     
@@ -263,8 +279,8 @@ Use /execute to start a task!
             return f"✅ **Task Complete**\n\n{result}"
             
         except Exception as e:
-            logger.error(f"Error executing task: {e}")
-            return f"❌ **Error**\n\n{str(e)}"
+            logger.exception("Error executing task")
+            return f"❌ **Error**\n\n{e}"
     
     async def _handle_specialized_task(self, message: IncomingMessage, user: Dict, 
                                        task_type: str, args: str) -> str:
@@ -278,7 +294,7 @@ Use /execute to start a task!
         """Send message through appropriate platform handler"""
         handler = self.handlers.get(platform)
         if not handler:
-            logger.error(f"No handler registered for platform: {platform}")
+            logger.error("No handler registered for platform: %s", platform)
             return False
         
         message = OutgoingMessage(
@@ -291,23 +307,41 @@ Use /execute to start a task!
         return await handler.send_message(message)
     
     async def setup_webhooks(self, base_url: str) -> Dict[str, bool]:
-        """Setup webhooks for all registered platforms"""
-        results = {}
+        """Setup webhooks for all registered platforms concurrently"""
+        targets = [
+            (platform, handler, f"{base_url}{handler.get_webhook_path()}")
+            for platform, handler in self.handlers.items()
+        ]
         
-        for platform, handler in self.handlers.items():
-            webhook_path = handler.get_webhook_path()
-            webhook_url = f"{base_url}{webhook_path}"
-            
-            success = await handler.setup_webhook(webhook_url)
-            results[platform.value] = success
-            
-            if success:
-                logger.info(f"Webhook setup successful for {platform.value}: {webhook_url}")
+        outcomes = await asyncio.gather(
+            *(handler.setup_webhook(url) for _, handler, url in targets),
+            return_exceptions=True,
+        )
+        
+        results = {}
+        for (platform, _, webhook_url), outcome in zip(targets, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Webhook setup failed for %s: %s", platform.value, outcome)
+                success = False
             else:
-                logger.error(f"Webhook setup failed for {platform.value}")
+                success = bool(outcome)
+                if success:
+                    logger.info("Webhook setup successful for %s: %s", platform.value, webhook_url)
+                else:
+                    logger.error("Webhook setup failed for %s", platform.value)
+            results[platform.value] = success
         
         return results
     
     def get_handler(self, platform: MessagePlatform):
         """Get handler for specific platform"""
         return self.handlers.get(platform)
+    
+    async def close(self):
+        """Close all handlers, the shared HTTP session and the user database"""
+        for handler in self.handlers.values():
+            close = getattr(handler, "close", None)
+            if close:
+                await close()
+        await close_shared_session()
+        self.db.close()
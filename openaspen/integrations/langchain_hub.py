@@ -1,89 +1,92 @@
-from typing import Any, Callable, Dict, List, Optional, Union
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
 from openaspen.core.leaf import Leaf
 from openaspen.core.branch import Branch
+import functools
+import importlib
 import logging
 import asyncio
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_tool_class(import_path: str, class_name: str) -> Any:
+    """Import a tool class once; failed imports raise and are not cached."""
+    module = importlib.import_module(import_path)
+    return getattr(module, class_name)
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """Where to import a LangChain tool from and how to construct it."""
+
+    import_path: str
+    class_name: str
+    description: str
+    default_params: Mapping[str, Any] = field(default_factory=dict)
+    requires_api_key: Optional[str] = None
+
+
 class LangChainHubLoader:
     """
     Loader for LangChain Hub tools to integrate as OpenAspen leaves.
     Supports loading pre-built tools from langchain_community.tools.
     """
 
-    AVAILABLE_TOOLS = {
-        "tavily_search": {
-            "import_path": "langchain_community.tools.tavily_search",
-            "class_name": "TavilySearchResults",
-            "description": "Search the web using Tavily API for real-time information",
-            "default_params": {"max_results": 5},
-            "requires_api_key": "TAVILY_API_KEY",
-        },
-        "duckduckgo_search": {
-            "import_path": "langchain_community.tools",
-            "class_name": "DuckDuckGoSearchRun",
-            "description": "Search the web using DuckDuckGo (no API key required)",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "wikipedia": {
-            "import_path": "langchain_community.tools",
-            "class_name": "WikipediaQueryRun",
-            "description": "Search Wikipedia for encyclopedic information",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "reddit_search": {
-            "import_path": "langchain_community.tools.reddit_search.tool",
-            "class_name": "RedditSearchRun",
-            "description": "Search Reddit posts and comments",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "youtube_search": {
-            "import_path": "langchain_community.tools",
-            "class_name": "YouTubeSearchTool",
-            "description": "Search YouTube videos",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "yahoo_finance_news": {
-            "import_path": "langchain_community.tools.yahoo_finance_news",
-            "class_name": "YahooFinanceNewsTool",
-            "description": "Get financial news from Yahoo Finance",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "requests_get": {
-            "import_path": "langchain_community.tools",
-            "class_name": "RequestsGetTool",
-            "description": "Make HTTP GET requests to APIs",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "requests_post": {
-            "import_path": "langchain_community.tools",
-            "class_name": "RequestsPostTool",
-            "description": "Make HTTP POST requests to APIs",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "python_repl": {
-            "import_path": "langchain_experimental.tools",
-            "class_name": "PythonREPLTool",
-            "description": "Execute Python code in a REPL environment",
-            "default_params": {},
-            "requires_api_key": None,
-        },
-        "arxiv": {
-            "import_path": "langchain_community.tools",
-            "class_name": "ArxivQueryRun",
-            "description": "Search arXiv for scientific papers",
-            "default_params": {},
-            "requires_api_key": None,
-        },
+    AVAILABLE_TOOLS: Dict[str, ToolSpec] = {
+        "tavily_search": ToolSpec(
+            import_path="langchain_community.tools.tavily_search",
+            class_name="TavilySearchResults",
+            description="Search the web using Tavily API for real-time information",
+            default_params={"max_results": 5},
+            requires_api_key="TAVILY_API_KEY",
+        ),
+        "duckduckgo_search": ToolSpec(
+            import_path="langchain_community.tools",
+            class_name="DuckDuckGoSearchRun",
+            description="Search the web using DuckDuckGo (no API key required)",
+        ),
+        "wikipedia": ToolSpec(
+            import_path="langchain_community.tools",
+            class_name="WikipediaQueryRun",
+            description="Search Wikipedia for encyclopedic information",
+        ),
+        "reddit_search": ToolSpec(
+            import_path="langchain_community.tools.reddit_search.tool",
+            class_name="RedditSearchRun",
+            description="Search Reddit posts and comments",
+        ),
+        "youtube_search": ToolSpec(
+            import_path="langchain_community.tools",
+            class_name="YouTubeSearchTool",
+            description="Search YouTube videos",
+        ),
+        "yahoo_finance_news": ToolSpec(
+            import_path="langchain_community.tools.yahoo_finance_news",
+            class_name="YahooFinanceNewsTool",
+            description="Get financial news from Yahoo Finance",
+        ),
+        "requests_get": ToolSpec(
+            import_path="langchain_community.tools",
+            class_name="RequestsGetTool",
+            description="Make HTTP GET requests to APIs",
+        ),
+        "requests_post": ToolSpec(
+            import_path="langchain_community.tools",
+            class_name="RequestsPostTool",
+            description="Make HTTP POST requests to APIs",
+        ),
+        "python_repl": ToolSpec(
+            import_path="langchain_experimental.tools",
+            class_name="PythonREPLTool",
+            description="Execute Python code in a REPL environment",
+        ),
+        "arxiv": ToolSpec(
+            import_path="langchain_community.tools",
+            class_name="ArxivQueryRun",
+            description="Search arXiv for scientific papers",
+        ),
     }
 
     @staticmethod
@@ -93,8 +96,9 @@ class LangChainHubLoader:
 
     @staticmethod
     def get_tool_info(tool_name: str) -> Optional[Dict[str, Any]]:
-        """Get information about a specific tool."""
-        return LangChainHubLoader.AVAILABLE_TOOLS.get(tool_name)
+        """Get information about a specific tool as a dict (a copy, safe to modify)."""
+        spec = LangChainHubLoader.AVAILABLE_TOOLS.get(tool_name)
+        return asdict(spec) if spec else None
 
     @staticmethod
     def load_tool(
@@ -114,29 +118,26 @@ class LangChainHubLoader:
         Raises:
             ValueError: If tool is not found or cannot be loaded
         """
-        tool_info = LangChainHubLoader.AVAILABLE_TOOLS.get(tool_name)
-        if not tool_info:
+        spec = LangChainHubLoader.AVAILABLE_TOOLS.get(tool_name)
+        if not spec:
             raise ValueError(
                 f"Tool '{tool_name}' not found. Available tools: {LangChainHubLoader.list_available_tools()}"
             )
 
         try:
-            import importlib
-
-            module = importlib.import_module(tool_info["import_path"])
-            tool_class = getattr(module, tool_info["class_name"])
+            tool_class = _resolve_tool_class(spec.import_path, spec.class_name)
 
-            params = {**tool_info["default_params"]}
+            params = {**spec.default_params}
             if custom_params:
                 params.update(custom_params)
 
-            if tool_info["requires_api_key"]:
+            if spec.requires_api_key:
                 import os
 
-                api_key = os.getenv(tool_info["requires_api_key"])
+                api_key = os.getenv(spec.requires_api_key)
                 if not api_key:
                     logger.warning(
-                        f"API key '{tool_info['requires_api_key']}' not found in environment. "
+                        f"API key '{spec.requires_api_key}' not found in environment. "
                         f"Tool '{tool_name}' may not work properly."
                     )
 
@@ -171,8 +172,8 @@ class LangChainHubLoader:
         Returns:
             Leaf instance wrapping the LangChain tool
         """
-        tool_info = LangChainHubLoader.AVAILABLE_TOOLS.get(tool_name)
-        if not tool_info:
+        spec = LangChainHubLoader.AVAILABLE_TOOLS.get(tool_name)
+        if not spec:
             raise ValueError(f"Tool '{tool_name}' not found")
 
         langchain_tool = LangChainHubLoader.load_tool(tool_name, custom_params)
@@ -198,7 +199,7 @@ class LangChainHubLoader:
         leaf = Leaf(
             name=leaf_name or tool_name,
             tool_func=tool_wrapper,
-            description=tool_info["description"],
+            description=spec.description,
             llm_provider=llm_provider,
         )
 
@@ -245,30 +246,57 @@ class LangChainHubLoader:
         return leaf
 
 
-def load_hub_tools(
+async def load_hub_tools_async(
     tool_names: Union[str, List[str]],
     llm: Optional[Any] = None,
 ) -> List[Any]:
     """
-    Convenience function to load multiple LangChain tools at once.
-    Compatible with LangChain's load_tools() pattern.
+    Load multiple LangChain tools concurrently.
+
+    Each load imports a module and builds a tool, which blocks, so the loads
+    run in worker threads. Tools that fail to load are logged and skipped.
 
     Args:
         tool_names: Single tool name or list of tool names
         llm: Optional LLM instance (for compatibility, not used)
 
     Returns:
-        List of loaded LangChain tools
+        List of loaded LangChain tools, in the order requested
     """
     if isinstance(tool_names, str):
         tool_names = [tool_names]
 
+    results = await asyncio.gather(
+        *(asyncio.to_thread(LangChainHubLoader.load_tool, tool_name) for tool_name in tool_names),
+        return_exceptions=True,
+    )
+
     tools = []
-    for tool_name in tool_names:
-        try:
-            tool = LangChainHubLoader.load_tool(tool_name)
-            tools.append(tool)
-        except Exception as e:
-            logger.error(f"Failed to load tool '{tool_name}': {e}")
+    for tool_name, result in zip(tool_names, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to load tool '%s': %s", tool_name, result)
+        else:
+            tools.append(result)
 
     return tools
+
+
+def load_hub_tools(
+    tool_names: Union[str, List[str]],
+    llm: Optional[Any] = None,
+) -> List[Any]:
+    """
+    Convenience function to load multiple LangChain tools at once.
+    Compatible with LangChain's load_tools() pattern.
+
+    Runs load_hub_tools_async on a new event loop; from async code, await
+    load_hub_tools_async instead.
+
+    Args:
+        tool_names: Single tool name or list of tool names
+        llm: Optional LLM instance (for compatibility, not used)
+
+    Returns:
+        List of loaded LangChain tools
+    """
+    return asyncio.run(load_hub_tools_async(tool_names, llm))
@@ -2,8 +2,9 @@
 Telegram Bot Integration for OpenAspen
 Enables 24/7 mobile access via Telegram messaging
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
@@ -14,7 +15,6 @@ from telegram.ext import (
     ContextTypes,
 )
 from telegram.constants import ParseMode
-import aiohttp
 
 from openaspen.integrations.base import (
     MessageHandler as BaseMessageHandler,
@@ -24,45 +24,28 @@ from openaspen.integrations.base import (
     MessageType,
     CommandParser,
 )
+from openaspen.integrations.batching import BatchingSender, TELEGRAM_MAX_CHARS, split_text
 
 logger = logging.getLogger(__name__)
 
+_MD = ParseMode.MARKDOWN
 
-class TelegramBot(BaseMessageHandler):
-    """Telegram bot handler for OpenAspen"""
-    
-    def __init__(self, token: str, tree_executor=None):
-        super().__init__(token, tree_executor)
-        self.application = None
-        self.webhook_url = None
-    
-    async def initialize(self):
-        """Initialize the Telegram bot application"""
-        self.application = Application.builder().token(self.token).build()
-        
-        # Add command handlers
-        self.application.add_handler(CommandHandler("start", self._handle_start))
-        self.application.add_handler(CommandHandler("help", self._handle_help))
-        self.application.add_handler(CommandHandler("tree", self._handle_tree))
-        self.application.add_handler(CommandHandler("execute", self._handle_execute))
-        self.application.add_handler(CommandHandler("status", self._handle_status))
-        self.application.add_handler(CommandHandler("crypto", self._handle_crypto))
-        self.application.add_handler(CommandHandler("social", self._handle_social))
-        self.application.add_handler(CommandHandler("content", self._handle_content))
-        
-        # Handle inline keyboard callbacks
-        self.application.add_handler(CallbackQueryHandler(self._handle_callback))
-        
-        # Handle all other messages
-        self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
-        )
-        
-        logger.info("Telegram bot initialized")
-    
-    async def _handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command"""
-        welcome_text = """
+# Seconds to wait for a task before sending a "processing" placeholder
+_PLACEHOLDER_DELAY = 0.4
+
+# Seconds an idle per-chat worker waits for new tasks before exiting
+_CHAT_IDLE_TIMEOUT = 60.0
+
+# Incoming texts at least this long were likely split by the client
+_SPLIT_CHUNK_CHARS = 4000
+
+# Seconds to wait for the continuation of a split message
+_CONTINUATION_WINDOW = 2.0
+
+# Only the update types the bot has handlers for
+_ALLOWED_UPDATES = ["message", "callback_query"]
+
+_START_TEXT = """
 🌲 **Welcome to OpenAspen!**
 
 I'm your 24/7 AI agent tree, ready to help with:
@@ -84,11 +67,8 @@ I'm your 24/7 AI agent tree, ready to help with:
 
 Let's get started! 🚀
 """
-        await update.message.reply_text(welcome_text, parse_mode=ParseMode.MARKDOWN)
-    
-    async def _handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /help command"""
-        help_text = """
+
+_HELP_TEXT = """
 📚 **OpenAspen Commands**
 
 **General:**
@@ -117,7 +97,115 @@ You can also just type naturally:
 
 🌲 Powered by OpenAspen Tree Architecture
 """
-        await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
+
+_STATUS_TEXT = """
+📊 **System Status**
+
+🟢 **Online** - All agents ready
+⚡ **Active Tasks:** 0
+🌲 **Tree:** Healthy
+
+**Recent Activity:**
+• No recent tasks
+
+Use /execute to start a new task!
+"""
+
+# (command, reply) for commands that always answer with the same text
+_STATIC_COMMANDS = (
+    ("start", _START_TEXT),
+    ("help", _HELP_TEXT),
+    ("status", _STATUS_TEXT),
+)
+
+# (command, default task) for commands that queue "<command>: <args>"
+_PREFIXED_COMMANDS = (
+    ("crypto", "crypto analysis"),
+    ("social", "social media task"),
+    ("content", "content generation"),
+)
+
+_DEMO_TREE_TEXT = """
+🌲 **OpenAspen Tree** (Demo Mode)
+
+📁 **Branches:**
+├─ 🤖 crypto_analyzer
+│  ├─ 📊 price_checker
+│  └─ 😊 sentiment_analyzer
+├─ 📱 social_manager
+│  ├─ 🐦 twitter_poster
+│  └─ 📸 content_scheduler
+└─ ✍️ content_generator
+   ├─ 📝 script_writer
+   └─ 🎨 image_generator
+
+Use /execute to interact with agents!
+"""
+
+
+class TelegramBot(BaseMessageHandler):
+    """Telegram bot handler for OpenAspen"""
+    
+    def __init__(self, token: str, tree_executor=None,
+                 batch_flush_interval: Optional[float] = None):
+        super().__init__(token, tree_executor)
+        self.application = None
+        self.webhook_url = None
+        # Set once start_webhook has handed update dispatch to the application
+        self.webhook_mode = False
+        # Outbound batching is opt-in: plain texts to the same chat are merged
+        self._batcher: Optional[BatchingSender] = None
+        if batch_flush_interval is not None:
+            self._batcher = BatchingSender(
+                self._send_text,
+                flush_interval=batch_flush_interval,
+                max_chars=TELEGRAM_MAX_CHARS,
+            )
+        # One task queue and worker per chat: chats run concurrently, each in order
+        self._chat_queues: Dict[int, asyncio.Queue] = {}
+        self._chat_workers: Dict[int, asyncio.Task] = {}
+        # Long incoming messages waiting for their continuation, per chat
+        self._text_buffers: Dict[int, Tuple[List[str], asyncio.TimerHandle, Update]] = {}
+    
+    async def initialize(self):
+        """Initialize the Telegram bot application"""
+        self.application = Application.builder().token(self.token).build()
+        
+        # Add command handlers
+        for command, text in _STATIC_COMMANDS:
+            self.application.add_handler(CommandHandler(command, self._static_reply(text)))
+        self.application.add_handler(CommandHandler("tree", self._handle_tree))
+        self.application.add_handler(CommandHandler("execute", self._handle_execute))
+        for prefix, default_task in _PREFIXED_COMMANDS:
+            self.application.add_handler(
+                CommandHandler(prefix, self._prefixed_task(prefix, default_task))
+            )
+        
+        # Handle inline keyboard callbacks
+        self.application.add_handler(CallbackQueryHandler(self._handle_callback))
+        
+        # Handle all other messages
+        self.application.add_handler(
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
+        )
+        
+        if self._batcher:
+            self._batcher.start()
+        
+        logger.info("Telegram bot initialized")
+    
+    def _static_reply(self, text: str):
+        """Build a command handler that replies with a fixed Markdown text"""
+        async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            await update.message.reply_text(text, parse_mode=_MD)
+        return handler
+    
+    def _prefixed_task(self, prefix: str, default_task: str):
+        """Build a command handler that queues "<prefix>: <args>" as a task"""
+        async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            task = " ".join(context.args) if context.args else default_task
+            self._enqueue_task(update, f"{prefix}: {task}")
+        return handler
     
     async def _handle_tree(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /tree command - show agent structure"""
@@ -143,7 +231,7 @@ You can also just type naturally:
             
             await update.message.reply_text(
                 tree_info,
-                parse_mode=ParseMode.MARKDOWN,
+                parse_mode=_MD,
                 reply_markup=reply_markup
             )
         except Exception as e:
@@ -155,48 +243,42 @@ You can also just type naturally:
         if not context.args:
             await update.message.reply_text(
                 "❌ Please provide a task.\n\nExample: `/execute Check BTC price`",
-                parse_mode=ParseMode.MARKDOWN
+                parse_mode=_MD
             )
             return
         
         task = " ".join(context.args)
-        await self._execute_task(update, task)
-    
-    async def _handle_crypto(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /crypto command"""
-        task = " ".join(context.args) if context.args else "crypto analysis"
-        await self._execute_task(update, f"crypto: {task}")
-    
-    async def _handle_social(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /social command"""
-        task = " ".join(context.args) if context.args else "social media task"
-        await self._execute_task(update, f"social: {task}")
-    
-    async def _handle_content(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /content command"""
-        task = " ".join(context.args) if context.args else "content generation"
-        await self._execute_task(update, f"content: {task}")
-    
-    async def _handle_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /status command"""
-        status_text = """
-📊 **System Status**
-
-🟢 **Online** - All agents ready
-⚡ **Active Tasks:** 0
-🌲 **Tree:** Healthy
-
-**Recent Activity:**
-• No recent tasks
-
-Use /execute to start a new task!
-"""
-        await update.message.reply_text(status_text, parse_mode=ParseMode.MARKDOWN)
+        self._enqueue_task(update, task)
     
     async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle regular text messages (natural language)"""
+        chat_id = update.effective_chat.id
         text = update.message.text
-        await self._execute_task(update, text)
+        
+        # Clients split long pastes into several messages; join them back together
+        parts = [text]
+        pending = self._text_buffers.pop(chat_id, None)
+        if pending:
+            pending_parts, timer, _ = pending
+            timer.cancel()
+            parts = pending_parts + parts
+        
+        if len(text) >= _SPLIT_CHUNK_CHARS:
+            # Probably cut at the client's split point: wait for the continuation
+            timer = asyncio.get_running_loop().call_later(
+                _CONTINUATION_WINDOW, self._flush_text_buffer, chat_id
+            )
+            self._text_buffers[chat_id] = (parts, timer, update)
+            return
+        
+        self._enqueue_task(update, "".join(parts))
+    
+    def _flush_text_buffer(self, chat_id: int):
+        """Queue a buffered long message once no continuation arrived in time"""
+        pending = self._text_buffers.pop(chat_id, None)
+        if pending:
+            parts, _, update = pending
+            self._enqueue_task(update, "".join(parts))
     
     async def _handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle inline keyboard button callbacks"""
@@ -205,26 +287,63 @@ Use /execute to start a new task!
         
         if query.data == "tree_refresh":
             tree_info = await self._get_tree_structure()
-            await query.edit_message_text(tree_info, parse_mode=ParseMode.MARKDOWN)
+            await query.edit_message_text(tree_info, parse_mode=_MD)
         elif query.data == "tree_status":
             await query.edit_message_text("📊 Status: All systems operational")
         elif query.data == "tree_execute":
             await query.edit_message_text("Use /execute <task> to run a task")
     
+    def _enqueue_task(self, update: Update, task: str):
+        """Queue a task on its chat's worker, starting the worker if needed"""
+        chat_id = update.effective_chat.id
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = self._chat_queues[chat_id] = asyncio.Queue()
+        queue.put_nowait((update, task))
+        
+        worker = self._chat_workers.get(chat_id)
+        if worker is None or worker.done():
+            self._chat_workers[chat_id] = asyncio.create_task(
+                self._chat_worker(chat_id, queue)
+            )
+    
+    async def _chat_worker(self, chat_id: int, queue: asyncio.Queue):
+        """Run a chat's queued tasks in order, exiting once the chat goes idle"""
+        try:
+            while True:
+                try:
+                    update, task = await asyncio.wait_for(queue.get(), _CHAT_IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    if queue.empty():
+                        break
+                    continue
+                try:
+                    await self._execute_task(update, task)
+                except Exception:
+                    logger.exception("Error in chat worker for %s", chat_id)
+        finally:
+            if self._chat_workers.get(chat_id) is asyncio.current_task():
+                del self._chat_workers[chat_id]
+                self._chat_queues.pop(chat_id, None)
+    
     async def _execute_task(self, update: Update, task: str):
-        """Execute a task through the tree"""
-        # Send "processing" message
-        processing_msg = await update.message.reply_text(
-            f"🌳 Processing: {task[:50]}...\n⏳ Please wait...",
-            parse_mode=ParseMode.MARKDOWN
-        )
+        """Execute a task through the tree, showing a placeholder only for slow tasks"""
+        executor = self.tree_executor
+        processing_msg = None
         
         try:
-            if not self.tree_executor:
+            if not executor:
                 result = f"✅ Task received: {task}\n\n⚠️ Tree executor not configured (demo mode)"
             else:
-                # Execute through OpenAspen tree
-                result = await self.tree_executor.execute(task)
+                # Race the task against a short timer so fast results need one API call
+                task_fut = asyncio.create_task(executor.execute(task))
+                done, _ = await asyncio.wait({task_fut}, timeout=_PLACEHOLDER_DELAY)
+                if task_fut not in done:
+                    processing_msg = await update.message.reply_text(
+                        f"🌳 Processing: {task[:50]}...\n⏳ Please wait...",
+                        parse_mode=_MD
+                    )
+                result = await task_fut
             
             # Format result
             response = f"✅ **Task Complete**\n\n{result}"
@@ -238,52 +357,35 @@ Use /execute to start a new task!
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            # Update message with result
-            await processing_msg.edit_text(
-                response,
-                parse_mode=ParseMode.MARKDOWN,
-                reply_markup=reply_markup
-            )
+            # Edit the placeholder if one was sent, otherwise reply directly
+            respond = processing_msg.edit_text if processing_msg else update.message.reply_text
+            await respond(response, parse_mode=_MD, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Error executing task: {e}")
-            await processing_msg.edit_text(
+            respond = processing_msg.edit_text if processing_msg else update.message.reply_text
+            await respond(
                 f"❌ **Error**\n\n{str(e)}\n\nTry /help for command examples",
-                parse_mode=ParseMode.MARKDOWN
+                parse_mode=_MD
             )
     
     async def _get_tree_structure(self) -> str:
         """Get formatted tree structure"""
         if not self.tree_executor:
-            return """
-🌲 **OpenAspen Tree** (Demo Mode)
-
-📁 **Branches:**
-├─ 🤖 crypto_analyzer
-│  ├─ 📊 price_checker
-│  └─ 😊 sentiment_analyzer
-├─ 📱 social_manager
-│  ├─ 🐦 twitter_poster
-│  └─ 📸 content_scheduler
-└─ ✍️ content_generator
-   ├─ 📝 script_writer
-   └─ 🎨 image_generator
-
-Use /execute to interact with agents!
-"""
+            return _DEMO_TREE_TEXT
         
         try:
             # Get actual tree structure from executor
             branches = getattr(self.tree_executor, 'branches', [])
-            tree_text = "🌲 **OpenAspen Tree**\n\n📁 **Branches:**\n"
+            parts = ["🌲 **OpenAspen Tree**\n\n📁 **Branches:**\n"]
             
             for branch in branches:
-                tree_text += f"├─ 🤖 {branch.name}\n"
-                leaves = getattr(branch, 'leaves', [])
+                parts.append(f"├─ 🤖 {branch.name}\n")
+                leaves = getattr(branch, 'leaves', ())
                 for leaf in leaves:
-                    tree_text += f"│  ├─ 🍃 {leaf.name}\n"
+                    parts.append(f"│  ├─ 🍃 {leaf.name}\n")
             
-            return tree_text
+            return "".join(parts)
         except Exception as e:
             logger.error(f"Error getting tree structure: {e}")
             return "🌲 **OpenAspen Tree**\n\n⚠️ Unable to load structure"
@@ -294,6 +396,10 @@ Use /execute to interact with agents!
             if not self.application:
                 await self.initialize()
             
+            if self._batcher and message.text and not message.inline_keyboard:
+                self._batcher.enqueue((message.chat_id, message.parse_mode), message.text)
+                return True
+            
             # Build keyboard if provided
             reply_markup = None
             if message.inline_keyboard:
@@ -306,23 +412,63 @@ Use /execute to interact with agents!
                     keyboard.append(button_row)
                 reply_markup = InlineKeyboardMarkup(keyboard)
             
-            # Send message
-            await self.application.bot.send_message(
-                chat_id=message.chat_id,
-                text=message.text,
-                parse_mode=message.parse_mode,
-                reply_markup=reply_markup
-            )
+            # Send message, split at paragraph boundaries to stay under the API limit;
+            # the keyboard goes on the last chunk
+            chunks = split_text(message.text, TELEGRAM_MAX_CHARS) if message.text else [message.text]
+            bot = self.application.bot
+            for i, chunk in enumerate(chunks):
+                await bot.send_message(
+                    chat_id=message.chat_id,
+                    text=chunk,
+                    parse_mode=message.parse_mode,
+                    reply_markup=reply_markup if i == len(chunks) - 1 else None
+                )
             return True
             
         except Exception as e:
             logger.error(f"Error sending Telegram message: {e}")
             return False
     
+    async def _send_text(self, key, text: str) -> bool:
+        """Send a batched plain-text payload; key is (chat_id, parse_mode)"""
+        chat_id, parse_mode = key
+        await self.application.bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            parse_mode=parse_mode,
+        )
+        return True
+    
+    async def close(self):
+        """Stop per-chat workers and flush any batched messages"""
+        for _, timer, _ in self._text_buffers.values():
+            timer.cancel()
+        self._text_buffers.clear()
+        
+        workers = list(self._chat_workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._chat_workers.clear()
+        self._chat_queues.clear()
+        
+        if self._batcher:
+            await self._batcher.stop()
+        
+        if self.webhook_mode:
+            await self.application.stop()
+            await self.application.shutdown()
+            self.webhook_mode = False
+    
+    def parse_update(self, payload: Dict[str, Any]) -> Update:
+        """Parse a webhook payload into a PTB Update (the only place payloads are parsed)"""
+        bot = self.application.bot if self.application else None
+        return Update.de_json(payload, bot)
+    
     async def handle_webhook(self, payload: Dict[str, Any]) -> Optional[IncomingMessage]:
         """Process incoming webhook payload"""
         try:
-            update = Update.de_json(payload, self.application.bot)
+            update = self.parse_update(payload)
             
             if update.message:
                 return IncomingMessage(
@@ -333,7 +479,9 @@ Use /execute to interact with agents!
                     message_id=str(update.message.message_id),
                     text=update.message.text,
                     message_type=MessageType.TEXT,
-                    timestamp=update.message.date
+                    timestamp=update.message.date,
+                    # Keep the parsed update so it can be dispatched without re-parsing
+                    metadata={"update": update}
                 )
             
             return None
@@ -349,7 +497,9 @@ Use /execute to interact with agents!
                 await self.initialize()
             
             self.webhook_url = webhook_url
-            await self.application.bot.set_webhook(url=webhook_url)
+            await self.application.bot.set_webhook(
+                url=webhook_url, allowed_updates=_ALLOWED_UPDATES
+            )
             logger.info(f"Telegram webhook set to: {webhook_url}")
             return True
             
@@ -357,6 +507,32 @@ Use /execute to interact with agents!
             logger.error(f"Error setting Telegram webhook: {e}")
             return False
     
+    async def start_webhook(self, webhook_url: str) -> bool:
+        """Start the application and let it dispatch webhook updates (for production)"""
+        try:
+            if not self.application:
+                await self.initialize()
+            
+            await self.application.initialize()
+            await self.application.start()
+            await self.application.bot.set_webhook(
+                url=webhook_url, allowed_updates=_ALLOWED_UPDATES
+            )
+            self.webhook_url = webhook_url
+            self.webhook_mode = True
+            logger.info(f"Telegram bot running in webhook mode at: {webhook_url}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error starting Telegram webhook mode: {e}")
+            return False
+    
+    async def process_update(self, update: Union[Update, Dict[str, Any]]):
+        """Dispatch an update (or raw webhook payload) through the application's own handlers"""
+        if not isinstance(update, Update):
+            update = self.parse_update(update)
+        await self.application.process_update(update)
+    
     async def delete_webhook(self) -> bool:
         """Remove Telegram webhook"""
         try:
@@ -381,4 +557,4 @@ Use /execute to interact with agents!
             await self.initialize()
         
         logger.info("Starting Telegram bot in polling mode...")
-        await self.application.run_polling()
+        await self.application.run_polling(allowed_updates=_ALLOWED_UPDATES)
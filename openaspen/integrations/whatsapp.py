@@ -2,11 +2,13 @@
 WhatsApp Bot Integration for OpenAspen
 Uses Meta WhatsApp Business Cloud API for 24/7 messaging
 """
+import hmac
 import logging
 from typing import Optional, Dict, Any, List
-import aiohttp
 import json
 
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
 from openaspen.integrations.base import (
     MessageHandler as BaseMessageHandler,
     IncomingMessage,
@@ -14,27 +16,84 @@ from openaspen.integrations.base import (
     MessagePlatform,
     MessageType,
 )
+from openaspen.integrations._http import get_shared_session
+from openaspen.integrations.batching import BatchingSender, WHATSAPP_MAX_CHARS
 
 logger = logging.getLogger(__name__)
 
 
+class WhatsAppText(BaseModel):
+    """Text body of an incoming WhatsApp message"""
+    body: Optional[str] = None
+
+
+class WhatsAppMessage(BaseModel):
+    """Incoming WhatsApp message (only the fields the bot reads)"""
+    model_config = ConfigDict(extra="ignore")
+    
+    sender: str = Field(alias="from")
+    id: str
+    text: Optional[WhatsAppText] = None
+
+
+class WhatsAppValue(BaseModel):
+    """Change value carrying the new messages"""
+    model_config = ConfigDict(extra="ignore")
+    
+    messages: List[WhatsAppMessage] = []
+
+
+class WhatsAppChange(BaseModel):
+    """Single change notification within an entry"""
+    model_config = ConfigDict(extra="ignore")
+    
+    value: WhatsAppValue = WhatsAppValue()
+
+
+class WhatsAppEntry(BaseModel):
+    """Per-account entry of a webhook payload"""
+    model_config = ConfigDict(extra="ignore")
+    
+    changes: List[WhatsAppChange] = []
+
+
+class WhatsAppWebhook(BaseModel):
+    """Meta webhook payload: entry[].changes[].value.messages[]"""
+    model_config = ConfigDict(extra="ignore")
+    
+    entry: List[WhatsAppEntry] = []
+
+
 class WhatsAppBot(BaseMessageHandler):
     """WhatsApp bot handler using Meta Cloud API"""
     
-    def __init__(self, token: str, phone_number_id: str, tree_executor=None):
+    def __init__(self, token: str, phone_number_id: str, tree_executor=None,
+                 batch_flush_interval: Optional[float] = None):
         super().__init__(token, tree_executor)
         self.phone_number_id = phone_number_id
         self.api_base = "https://graph.facebook.com/v18.0"
         self.verify_token = None
+        # Outbound batching is opt-in: plain texts to the same chat are merged
+        self._batcher: Optional[BatchingSender] = None
+        if batch_flush_interval is not None:
+            self._batcher = BatchingSender(
+                self._send_text,
+                flush_interval=batch_flush_interval,
+                max_chars=WHATSAPP_MAX_CHARS,
+            )
+    
+    async def close(self):
+        """Flush batched messages"""
+        if self._batcher:
+            await self._batcher.stop()
     
     async def send_message(self, message: OutgoingMessage) -> bool:
         """Send a message via WhatsApp"""
         try:
-            url = f"{self.api_base}/{self.phone_number_id}/messages"
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Content-Type": "application/json"
-            }
+            if (self._batcher and message.text and not message.buttons
+                    and message.message_type == MessageType.TEXT):
+                self._batcher.enqueue(message.chat_id, message.text)
+                return True
             
             # Build message payload
             payload = {
@@ -68,21 +127,40 @@ class WhatsAppBot(BaseMessageHandler):
                     }
                 }
             
-            # Send request
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        logger.info(f"WhatsApp message sent to {message.chat_id}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"WhatsApp API error: {error_text}")
-                        return False
+            return await self._post_message(payload)
                         
         except Exception as e:
             logger.error(f"Error sending WhatsApp message: {e}")
             return False
     
+    async def _post_message(self, payload: Dict[str, Any]) -> bool:
+        """POST a message payload to the Cloud API"""
+        url = f"{self.api_base}/{self.phone_number_id}/messages"
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json"
+        }
+        
+        session = await get_shared_session()
+        async with session.post(url, headers=headers, json=payload) as response:
+            if response.status == 200:
+                logger.info(f"WhatsApp message sent to {payload['to']}")
+                return True
+            else:
+                error_text = await response.text()
+                logger.error(f"WhatsApp API error: {error_text}")
+                return False
+    
+    async def _send_text(self, chat_id: str, text: str) -> bool:
+        """Send a batched plain-text payload"""
+        return await self._post_message({
+            "messaging_product": "whatsapp",
+            "recipient_type": "individual",
+            "to": chat_id,
+            "type": "text",
+            "text": {"body": text},
+        })
+    
     async def send_template(self, chat_id: str, template_name: str, language: str = "en_US") -> bool:
         """Send a WhatsApp template message (for business messaging)"""
         try:
@@ -102,9 +180,9 @@ class WhatsAppBot(BaseMessageHandler):
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    return response.status == 200
+            session = await get_shared_session()
+            async with session.post(url, headers=headers, json=payload) as response:
+                return response.status == 200
                     
         except Exception as e:
             logger.error(f"Error sending WhatsApp template: {e}")
@@ -113,34 +191,37 @@ class WhatsAppBot(BaseMessageHandler):
     async def handle_webhook(self, payload: Dict[str, Any]) -> Optional[IncomingMessage]:
         """Process incoming WhatsApp webhook payload"""
         try:
-            # WhatsApp webhook structure
-            entry = payload.get("entry", [{}])[0]
-            changes = entry.get("changes", [{}])[0]
-            value = changes.get("value", {})
-            messages = value.get("messages", [])
-            
-            if not messages:
-                return None
-            
-            msg = messages[0]
-            
-            return IncomingMessage(
-                platform=MessagePlatform.WHATSAPP,
-                chat_id=msg.get("from"),
-                user_id=msg.get("from"),
-                message_id=msg.get("id"),
-                text=msg.get("text", {}).get("body"),
-                message_type=MessageType.TEXT,
-                metadata={"whatsapp_data": msg}
-            )
-            
-        except Exception as e:
-            logger.error(f"Error handling WhatsApp webhook: {e}")
+            webhook = WhatsAppWebhook.model_validate(payload)
+        except ValidationError as e:
+            logger.error(f"Invalid WhatsApp webhook payload: {e}")
+            return None
+        
+        if not webhook.entry or not webhook.entry[0].changes:
+            return None
+        messages = webhook.entry[0].changes[0].value.messages
+        if not messages:
             return None
+        
+        msg = messages[0]
+        return IncomingMessage(
+            platform=MessagePlatform.WHATSAPP,
+            chat_id=msg.sender,
+            user_id=msg.sender,
+            message_id=msg.id,
+            text=msg.text.body if msg.text else None,
+            message_type=MessageType.TEXT,
+            # Raw message dict, as delivered by Meta
+            metadata={"whatsapp_data": payload["entry"][0]["changes"][0]["value"]["messages"][0]}
+        )
     
     async def verify_webhook(self, mode: str, token: str, challenge: str) -> Optional[str]:
         """Verify WhatsApp webhook (Meta requirement)"""
-        if mode == "subscribe" and token == self.verify_token:
+        if (
+            mode == "subscribe"
+            and token is not None
+            and self.verify_token is not None
+            and hmac.compare_digest(token.encode(), self.verify_token.encode())
+        ):
             logger.info("WhatsApp webhook verified")
             return challenge
         return None
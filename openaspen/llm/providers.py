@@ -1,5 +1,7 @@
 from enum import Enum
-from typing import Dict, Any, Optional
+import os
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
 
 
@@ -27,6 +29,23 @@ class LLMConfig(BaseModel):
         use_enum_values = True
 
 
+# Providers that run locally and accept any API key
+LOCAL_PROVIDERS = frozenset({LLMProvider.OLLAMA.value, LLMProvider.LMSTUDIO.value})
+
+# Environment variable holding each hosted provider's API key
+API_KEY_ENV_VARS: Dict[str, str] = {p.value: f"{p.value.upper()}_API_KEY" for p in LLMProvider}
+
+
+def resolve_api_key(provider: str, api_key: Optional[str] = None) -> Optional[str]:
+    if provider in LOCAL_PROVIDERS:
+        return api_key or "not-needed"
+    if api_key:
+        return api_key
+    # Read at call time: .env files are usually loaded after this module is imported
+    env_var = API_KEY_ENV_VARS.get(provider) or f"{provider.upper()}_API_KEY"
+    return os.getenv(env_var)
+
+
 PROVIDER_DEFAULTS: Dict[str, Dict[str, Any]] = {
     "openai": {
         "model": "gpt-4-turbo-preview",
@@ -65,17 +84,34 @@ def create_llm_config(
     api_key: Optional[str] = None,
     **kwargs: Any,
 ) -> LLMConfig:
-    defaults = PROVIDER_DEFAULTS.get(provider, {})
-    
     # For local providers, set a dummy API key if not provided
-    if provider in ["ollama", "lmstudio"] and api_key is None:
+    if provider in LOCAL_PROVIDERS and api_key is None:
         api_key = "not-needed"
-    
+
+    # The api_key is applied to a copy so secrets never end up in the cache key
+    try:
+        config = _create_llm_config_cached(provider, model, tuple(sorted(kwargs.items())))
+    except TypeError:
+        # Unhashable kwargs (e.g. a metadata dict) skip the cache
+        config = _build_llm_config(provider, model, kwargs)
+    return config.model_copy(update={"api_key": api_key}, deep=True)
+
+
+@lru_cache(maxsize=128)
+def _create_llm_config_cached(
+    provider: str,
+    model: Optional[str],
+    kwargs_items: Tuple[Tuple[str, Any], ...],
+) -> LLMConfig:
+    return _build_llm_config(provider, model, dict(kwargs_items))
+
+
+def _build_llm_config(provider: str, model: Optional[str], kwargs: Dict[str, Any]) -> LLMConfig:
+    defaults = PROVIDER_DEFAULTS.get(provider, {})
     config_data = {
+        **defaults,
         "provider": provider,
         "model": model or defaults.get("model", "default"),
-        "api_key": api_key,
-        **defaults,
         **kwargs,
     }
     return LLMConfig(**config_data)
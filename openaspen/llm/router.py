@@ -1,18 +1,65 @@
-from typing import Dict, Optional, Any, List
+from bisect import bisect_right
+from typing import Callable, Dict, Optional, Any, List, Tuple
+import asyncio
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain.chat_models.base import BaseChatModel
-from openaspen.llm.providers import LLMConfig, LLMProvider
+from openaspen.llm.providers import LLMConfig, LLMProvider, resolve_api_key
 import logging
-import os
 
 logger = logging.getLogger(__name__)
 
 
+def _common_kwargs(config: LLMConfig) -> Dict[str, Any]:
+    return {
+        "model": config.model,
+        "temperature": config.temperature,
+        "max_tokens": config.max_tokens,
+        "timeout": config.timeout,
+    }
+
+
+def _make_openai(config: LLMConfig, api_key: Optional[str]) -> BaseChatModel:
+    return ChatOpenAI(api_key=api_key, **_common_kwargs(config))
+
+
+def _make_anthropic(config: LLMConfig, api_key: Optional[str]) -> BaseChatModel:
+    return ChatAnthropic(api_key=api_key, **_common_kwargs(config))
+
+
+def _make_openai_compatible(config: LLMConfig, api_key: Optional[str]) -> BaseChatModel:
+    return ChatOpenAI(api_key=api_key, base_url=config.api_base, **_common_kwargs(config))
+
+
+def _make_local(config: LLMConfig, api_key: Optional[str]) -> BaseChatModel:
+    return ChatOpenAI(api_key="not-needed", base_url=config.api_base, **_common_kwargs(config))
+
+
+# Keyed by enum value: LLMConfig stores the provider as a plain string
+_FACTORIES: Dict[str, Callable[[LLMConfig, Optional[str]], BaseChatModel]] = {
+    LLMProvider.OPENAI.value: _make_openai,
+    LLMProvider.ANTHROPIC.value: _make_anthropic,
+    LLMProvider.GROK.value: _make_openai_compatible,
+    LLMProvider.OLLAMA.value: _make_local,
+    LLMProvider.LMSTUDIO.value: _make_local,
+}
+
+# Preferred providers per skill, best first
+_SKILL_PREFERENCES: Dict[str, Tuple[str, ...]] = {
+    "coding": ("openai", "anthropic"),
+    "creative": ("anthropic", "grok"),
+    "fast": ("grok", "ollama"),
+    "local": ("ollama", "lmstudio"),
+}
+
 class LLMRouter:
     def __init__(self, configs: Dict[str, LLMConfig]):
         self.configs = configs
         self._llm_cache: Dict[str, BaseChatModel] = {}
+        self._costs: List[float] = []
+        self._best_by_cost: List[str] = []
+        self._by_speed: List[Tuple[str, float]] = []
+        self._by_skill: Dict[str, str] = {}
         self._initialize_llms()
 
     def _initialize_llms(self) -> None:
@@ -23,94 +70,84 @@ class LLMRouter:
                 logger.info(f"Initialized LLM provider: {provider_name}")
             except Exception as e:
                 logger.error(f"Failed to initialize {provider_name}: {e}")
+        self._rebuild_routing_index()
+
+    def _rebuild_routing_index(self) -> None:
+        # Costs ascending, paired with the fastest provider at or below each cost
+        # (ties go to the earliest configured provider, as max() would pick)
+        order = {name: i for i, name in enumerate(self.configs)}
+        by_cost = sorted(self.configs.items(), key=lambda kv: kv[1].cost_per_1k_tokens)
+        self._costs = [config.cost_per_1k_tokens for _, config in by_cost]
+        self._best_by_cost = []
+        best_name, best_speed = None, float("-inf")
+        for name, config in by_cost:
+            if config.speed_score > best_speed or (
+                config.speed_score == best_speed and order[name] < order[best_name]
+            ):
+                best_name, best_speed = name, config.speed_score
+            self._best_by_cost.append(best_name)
+
+        self._by_speed = sorted(
+            ((name, config.speed_score) for name, config in self.configs.items()),
+            key=lambda item: -item[1],
+        )
+
+        # First initialized preferred provider per skill; skills with none fall back at lookup
+        self._by_skill = {}
+        for skill, providers in _SKILL_PREFERENCES.items():
+            match = next((p for p in providers if p in self._llm_cache), None)
+            if match is not None:
+                self._by_skill[skill] = match
 
     def _create_llm(self, config: LLMConfig) -> BaseChatModel:
-        # For local providers, use dummy API key if not provided
-        if config.provider in [LLMProvider.OLLAMA, LLMProvider.LMSTUDIO]:
-            api_key = config.api_key or "not-needed"
-        else:
-            api_key = config.api_key or os.getenv(f"{config.provider.upper()}_API_KEY")
-
-        if config.provider == LLMProvider.OPENAI:
-            return ChatOpenAI(
-                model=config.model,
-                api_key=api_key,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens,
-                timeout=config.timeout,
-            )
-        elif config.provider == LLMProvider.ANTHROPIC:
-            return ChatAnthropic(
-                model=config.model,
-                api_key=api_key,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens,
-                timeout=config.timeout,
-            )
-        elif config.provider == LLMProvider.GROK:
-            return ChatOpenAI(
-                model=config.model,
-                api_key=api_key,
-                base_url=config.api_base,
-                temperature=config.temperature,
-                max_tokens=config.max_tokens,
-                timeout=config.timeout,
-            )
-        elif config.provider in [LLMProvider.OLLAMA, LLMProvider.LMSTUDIO]:
-            return ChatOpenAI(
-                model=config.model,
-                base_url=config.api_base,
-                api_key="not-needed",
-                temperature=config.temperature,
-                max_tokens=config.max_tokens,
-                timeout=config.timeout,
-            )
-        else:
+        factory = _FACTORIES.get(config.provider)
+        if factory is None:
             raise ValueError(f"Unsupported provider: {config.provider}")
 
+        return factory(config, resolve_api_key(config.provider, config.api_key))
+
     async def get_llm(self, provider_name: Optional[str] = None) -> BaseChatModel:
-        if provider_name and provider_name in self._llm_cache:
-            return self._llm_cache[provider_name]
+        if provider_name:
+            try:
+                return self._llm_cache[provider_name]
+            except KeyError:
+                pass
 
         if not self._llm_cache:
             raise ValueError("No LLM providers configured")
 
-        return list(self._llm_cache.values())[0]
+        return next(iter(self._llm_cache.values()))
+
+    async def warmup(self) -> None:
+        # A free models listing per OpenAI-compatible client opens its connection pool
+        # (DNS, TCP, TLS) before the first real request; failures only cost the warmup
+        async def ping(name: str, llm: BaseChatModel) -> None:
+            client = getattr(llm, "root_async_client", None)
+            if client is None:
+                return
+            try:
+                await client.models.list()
+            except Exception as e:
+                logger.debug(f"Warmup request for {name} failed: {e}")
+
+        await asyncio.gather(*(ping(name, llm) for name, llm in self._llm_cache.items()))
 
     def route_by_cost(self, max_cost_per_1k: float = 0.01) -> Optional[str]:
-        eligible = [
-            (name, config)
-            for name, config in self.configs.items()
-            if config.cost_per_1k_tokens <= max_cost_per_1k
-        ]
-        if not eligible:
+        i = bisect_right(self._costs, max_cost_per_1k)
+        if i == 0:
             return None
-        return max(eligible, key=lambda x: x[1].speed_score)[0]
+        return self._best_by_cost[i - 1]
 
     def route_by_speed(self, min_speed_score: float = 0.5) -> Optional[str]:
-        eligible = [
-            (name, config)
-            for name, config in self.configs.items()
-            if config.speed_score >= min_speed_score
-        ]
-        if not eligible:
+        if not self._by_speed or self._by_speed[0][1] < min_speed_score:
             return None
-        return max(eligible, key=lambda x: x[1].speed_score)[0]
+        return self._by_speed[0][0]
 
     def route_by_skill(self, skill_type: str) -> Optional[str]:
-        skill_mapping = {
-            "coding": ["openai", "anthropic"],
-            "creative": ["anthropic", "grok"],
-            "fast": ["grok", "ollama"],
-            "local": ["ollama", "lmstudio"],
-        }
-
-        preferred_providers = skill_mapping.get(skill_type, [])
-        for provider in preferred_providers:
-            if provider in self._llm_cache:
-                return provider
-
-        return list(self._llm_cache.keys())[0] if self._llm_cache else None
+        provider = self._by_skill.get(skill_type)
+        if provider is not None:
+            return provider
+        return next(iter(self._llm_cache), None)
 
     def get_available_providers(self) -> List[str]:
         return list(self._llm_cache.keys())
@@ -123,6 +160,7 @@ class LLMRouter:
             logger.info(f"Added LLM provider: {name}")
         except Exception as e:
             logger.error(f"Failed to add provider {name}: {e}")
+        self._rebuild_routing_index()
 
     def remove_provider(self, name: str) -> None:
         if name in self.configs:
@@ -130,3 +168,5 @@ class LLMRouter:
         if name in self._llm_cache:
             del self._llm_cache[name]
             logger.info(f"Removed LLM provider: {name}")
+        # After both removals, since skill routing only considers initialized providers
+        self._rebuild_routing_index()
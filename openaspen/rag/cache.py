@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+import hashlib
+import sqlite3
+import threading
+import faiss
+import numpy as np
+
+if TYPE_CHECKING:
+    from openaspen.rag.embeddings import EmbeddingManager
+
+# Stay well under SQLite's bound-parameter limit for IN (...) lookups
+_LOOKUP_CHUNK = 500
+
+
+class EmbeddingCache:
+    # Vectors are stored as float32 bytes keyed by sha256(namespace, text); the
+    # namespace holds provider and model so a model swap never returns stale vectors
+    def __init__(self, path: str, namespace: str):
+        self.path = path
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = list(keys[i:i + _LOOKUP_CHUNK])
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def set_many(self, items: Dict[str, Sequence[float]]) -> None:
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SemanticResponseCache:
+    # Maps prompt embeddings to earlier responses; a lookup hits when the nearest
+    # cached prompt has cosine similarity >= threshold. Entries are evicted LRU.
+    def __init__(
+        self,
+        embedding_manager: "EmbeddingManager",
+        threshold: float = 0.97,
+        max_entries: int = 1024,
+    ):
+        self.embedding_manager = embedding_manager
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._index: Optional[faiss.IndexIDMap2] = None
+        self._responses: "OrderedDict[int, Any]" = OrderedDict()
+        self._next_id = 0
+
+    async def _embed(self, prompt: str) -> np.ndarray:
+        # embed_query memoizes by text, so get() followed by set() embeds once
+        vector = np.array(await self.embedding_manager.embed_query(prompt), dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
+
+    async def get(self, prompt: str) -> Optional[Any]:
+        if not self._responses:
+            return None
+
+        scores, ids = self._index.search(await self._embed(prompt), 1)
+        entry_id = int(ids[0, 0])
+        if entry_id < 0 or scores[0, 0] < self.threshold:
+            return None
+
+        self._responses.move_to_end(entry_id)
+        return self._responses[entry_id]
+
+    async def set(self, prompt: str, response: Any) -> None:
+        vector = await self._embed(prompt)
+        if self._index is None:
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+        self._responses[entry_id] = response
+
+        if len(self._responses) > self.max_entries:
+            evicted, _ = self._responses.popitem(last=False)
+            self._index.remove_ids(faiss.IDSelectorArray(np.array([evicted], dtype=np.int64)))
+
+    def clear(self) -> None:
+        self._index = None
+        self._responses.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
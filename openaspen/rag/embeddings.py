@@ -1,6 +1,16 @@
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from langchain.embeddings.base import Embeddings
+import asyncio
+import hashlib
 import os
+import numpy as np
+from openaspen.rag.cache import EmbeddingCache
+
+# Embedding clients shared by every manager with the same settings, so building
+# another EmbeddingManager reuses the loaded model / connection pool. Keyed by
+# (provider, model, backend, sha256 of the API key)
+_CLIENT_CACHE: Dict[Tuple[str, str, str, str], Embeddings] = {}
 
 
 class EmbeddingManager:
@@ -9,11 +19,39 @@ class EmbeddingManager:
         provider: str = "huggingface",
         model: str = "sentence-transformers/all-MiniLM-L6-v2",
         api_key: Optional[str] = None,
+        backend: str = "fastembed",
+        cache_path: Optional[str] = None,
+        query_cache_size: int = 1024,
+        http_async_client: Optional[Any] = None,
     ):
         self.provider = provider
         self.model = model
         self.api_key = api_key
-        self._embeddings = self._create_embeddings()
+        self.backend = backend
+        # Shared httpx.AsyncClient so remote embedding calls reuse the caller's connection pool
+        self.http_async_client = http_async_client
+        self._embeddings = self._shared_embeddings()
+        # Optional persistent cache so unchanged texts are not re-embedded across runs
+        self._cache: Optional[EmbeddingCache] = None
+        if cache_path:
+            self._cache = EmbeddingCache(cache_path, namespace=f"{provider}\0{model}")
+        # In-process LRU of query vectors plus in-flight requests, so concurrent
+        # identical queries share one embedding call
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_inflight: Dict[str, "asyncio.Task[np.ndarray]"] = {}
+
+    def _shared_embeddings(self) -> Embeddings:
+        # A caller-supplied HTTP client is theirs to manage, so that client is not shared
+        if self.http_async_client is not None:
+            return self._create_embeddings()
+
+        api_key = self.api_key or (os.getenv("OPENAI_API_KEY", "") if self.provider == "openai" else "")
+        key = (self.provider, self.model, self.backend, hashlib.sha256(api_key.encode()).hexdigest())
+        embeddings = _CLIENT_CACHE.get(key)
+        if embeddings is None:
+            embeddings = _CLIENT_CACHE[key] = self._create_embeddings()
+        return embeddings
 
     def _create_embeddings(self) -> Embeddings:
         if self.provider == "openai":
@@ -21,8 +59,17 @@ class EmbeddingManager:
             api_key = self.api_key or os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OpenAI API key required for OpenAI embeddings. Set OPENAI_API_KEY or use provider='huggingface'")
-            return OpenAIEmbeddings(model=self.model, api_key=api_key)
+            return OpenAIEmbeddings(
+                model=self.model, api_key=api_key, http_async_client=self.http_async_client
+            )
         elif self.provider == "huggingface":
+            # fastembed runs the same model through quantized ONNX on CPU (same 384-dim vectors)
+            if self.backend == "fastembed":
+                try:
+                    from langchain_community.embeddings import FastEmbedEmbeddings
+                    return FastEmbedEmbeddings(model_name=self.model, threads=os.cpu_count())
+                except ImportError:
+                    pass
             try:
                 from langchain_huggingface import HuggingFaceEmbeddings
                 return HuggingFaceEmbeddings(model_name=self.model)
@@ -44,11 +91,85 @@ class EmbeddingManager:
         else:
             raise ValueError(f"Unsupported embedding provider: {self.provider}. Use 'huggingface', 'openai', or 'fake'")
 
-    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return await self._embeddings.aembed_documents(texts)
+    async def embed_documents(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+    ) -> np.ndarray:
+        return np.asarray(
+            await self.embed_documents_list(texts, batch_size, max_concurrency),
+            dtype=np.float32,
+        )
+
+    async def embed_documents_list(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+    ) -> List[List[float]]:
+        if self._cache is None:
+            return await self._embed_batched(texts, batch_size, max_concurrency)
+
+        keys = [self._cache.key(text) for text in texts]
+        cached = await asyncio.to_thread(self._cache.get_many, keys)
+
+        # Embed each distinct missing text once
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            vectors = await self._embed_batched(list(missing.values()), batch_size, max_concurrency)
+            fresh = dict(zip(missing, vectors))
+            await asyncio.to_thread(self._cache.set_many, fresh)
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    async def _embed_batched(
+        self,
+        texts: List[str],
+        batch_size: int,
+        max_concurrency: int,
+    ) -> List[List[float]]:
+        if len(texts) <= batch_size:
+            return await self._embeddings.aembed_documents(texts)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def embed_chunk(chunk: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._embeddings.aembed_documents(chunk)
+
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+        return [vector for chunk_vectors in results for vector in chunk_vectors]
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        vector = self._query_cache.get(text)
+        if vector is not None:
+            self._query_cache.move_to_end(text)
+            return vector
+
+        task = self._query_inflight.get(text)
+        if task is not None:
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._embed_query_uncached(text))
+        self._query_inflight[text] = task
+        try:
+            vector = await asyncio.shield(task)
+        finally:
+            self._query_inflight.pop(text, None)
+
+        self._query_cache[text] = vector
+        if len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+        return vector
 
-    async def embed_query(self, text: str) -> List[float]:
-        return await self._embeddings.aembed_query(text)
+    async def _embed_query_uncached(self, text: str) -> np.ndarray:
+        vector = np.asarray(await self._embeddings.aembed_query(text), dtype=np.float32)
+        # Cached vectors are shared between callers
+        vector.flags.writeable = False
+        return vector
 
     def get_embeddings(self) -> Embeddings:
         return self._embeddings
@@ -1,12 +1,32 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from langchain_core.documents import Document
 from openaspen.rag.embeddings import EmbeddingManager
 from openaspen.core.leaf import Leaf
 from openaspen.core.branch import Branch
+import asyncio
+import json
 import logging
+import math
+import os
+import faiss
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Switch from exact flat search to an IVF index once the corpus gets this large
+IVF_THRESHOLD = 10_000
+
+# Rows preallocated in the reusable query buffer (grown for larger batches)
+QUERY_BUFFER_ROWS = 64
+
+# Element types for the exact (pre-IVF) index; vectors are L2-normalized, so every
+# component lies in [-1, 1] and int8 can use one fixed range without training on data
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# FAISS index and its row-aligned documents, written to persist_directory by persist()
+INDEX_FILENAME = "index.faiss"
+DOCUMENTS_FILENAME = "documents.json"
+
 
 class GroupRAGStore:
     def __init__(
@@ -14,72 +34,371 @@ class GroupRAGStore:
         persist_directory: str = "./vector_db",
         embedding_manager: Optional[EmbeddingManager] = None,
         use_faiss: bool = True,
+        use_gpu: bool = False,
+        load_persisted: bool = False,
+        vector_dtype: str = "float32",
     ):
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector_dtype: {vector_dtype}. Use one of {', '.join(VECTOR_DTYPES)}")
         self.persist_directory = persist_directory
+        self.vector_dtype = vector_dtype
         self.embedding_manager = embedding_manager or EmbeddingManager(provider="fake")
         self._vectorstore: Optional[Any] = None
         self.use_faiss = use_faiss
+        self.use_gpu = use_gpu
         self._initialize_store()
+        # Opt-in so trees that re-index on startup do not add their leaves twice
+        if use_faiss and load_persisted:
+            self._load_faiss()
 
     def _initialize_store(self) -> None:
-        # Don't initialize FAISS until we have documents (can't create from empty list)
-        # Will be initialized on first document add
+        # FAISS indexes are created on the first add, once the embedding dimension is known.
+        # The FAISS path uses the native index directly: vectors are L2-normalized so inner
+        # product is cosine similarity, and row i of the index is self._documents[i]
         self._vectorstore = None
-        self._documents = []
+        self._index: Optional[faiss.Index] = None
+        # Optional GPU replica used for searches; the CPU index stays the source of truth
+        self._gpu_index: Optional[faiss.Index] = None
+        self._nprobe: Optional[int] = None
+        # Set while the index is the memory-mapped copy loaded from disk (read-only)
+        self._mmap_path: Optional[str] = None
+        # Normalized query vectors are written here instead of a fresh array per search
+        self._query_buf: Optional[np.ndarray] = None
+        self._documents: List[Document] = []
+        # Index rows per branch, so branch filters become FAISS ID selectors
+        self._branch_ids: Dict[str, List[int]] = {}
+        # Rows per metadata value for other filter keys, built per key on first use
+        # and dropped whenever documents are added
+        self._filter_index: Dict[str, Dict[Any, List[int]]] = {}
+        # Chroma document count, kept on insert so get_stats never queries the collection
+        self._doc_count = 0
         self._initialized = False
         logger.info(f"Vector store ready (will initialize on first document)")
 
-    async def index_leaf(self, leaf: Leaf, branch_name: str) -> None:
-        text = leaf.get_embedding_text()
+    def _faiss_paths(self) -> Tuple[str, str]:
+        return (
+            os.path.join(self.persist_directory, INDEX_FILENAME),
+            os.path.join(self.persist_directory, DOCUMENTS_FILENAME),
+        )
+
+    def _load_faiss(self) -> None:
+        index_path, documents_path = self._faiss_paths()
+        if not (os.path.exists(index_path) and os.path.exists(documents_path)):
+            return
+
+        # IVF lists stay on disk and are paged in by the kernel instead of read into the heap
+        index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        with open(documents_path, encoding="utf-8") as f:
+            documents = [Document(**doc) for doc in json.load(f)]
+        if len(documents) != index.ntotal:
+            logger.warning(f"Ignoring persisted FAISS index: {index.ntotal} vectors but {len(documents)} documents")
+            return
+
+        self._index = index
+        self._documents = documents
+        self._filter_index = {}
+        for row, doc in enumerate(documents):
+            self._branch_ids.setdefault(doc.metadata.get("branch"), []).append(row)
+        if isinstance(index, faiss.IndexIVF):
+            self._nprobe = index.nprobe
+            self._mmap_path = index_path
+        if self.use_gpu:
+            self._gpu_index = self._clone_to_gpu(index)
+        self._initialized = True
+        logger.info(f"Loaded FAISS index with {index.ntotal} vectors from {self.persist_directory}")
+
+    def _is_ready(self) -> bool:
+        if self.use_faiss:
+            return self._index is not None
+        return self._vectorstore is not None
+
+    def _leaf_document(self, leaf: Leaf, branch_name: str, path: Optional[str] = None) -> Document:
+        if path is None:
+            path = "/".join(leaf.get_path())
         metadata = {
             "leaf_name": leaf.name,
             "branch": branch_name,
             "type": "leaf",
             "description": leaf.description,
-            "path": "/".join(leaf.get_path()),
+            "path": path,
         }
+        return Document(page_content=leaf.get_embedding_text(path=path), metadata=metadata)
 
-        doc = Document(page_content=text, metadata=metadata)
-        self._documents.append(doc)
-        
-        # Initialize FAISS on first document if not already initialized
+    async def _add_documents(self, docs: List[Document]) -> None:
+        if self.use_faiss:
+            await self._add_to_faiss(docs)
+            return
+
+        self._documents.extend(docs)
+
+        # Initialize ChromaDB on the first documents if not already initialized
         if not self._initialized:
             try:
-                if self.use_faiss:
-                    from langchain_community.vectorstores import FAISS
-                    self._vectorstore = FAISS.from_documents(
-                        self._documents,
-                        embedding=self.embedding_manager.get_embeddings(),
-                    )
-                    self._initialized = True
-                    logger.info(f"Initialized FAISS vector store with {len(self._documents)} documents")
-                else:
-                    from langchain_community.vectorstores import Chroma
-                    self._vectorstore = Chroma(
-                        persist_directory=self.persist_directory,
-                        embedding_function=self.embedding_manager.get_embeddings(),
-                    )
-                    await self._vectorstore.aadd_documents(self._documents)
-                    self._initialized = True
-                    logger.info(f"Initialized ChromaDB at {self.persist_directory}")
+                from langchain_community.vectorstores import Chroma
+                self._vectorstore = Chroma(
+                    persist_directory=self.persist_directory,
+                    embedding_function=self.embedding_manager.get_embeddings(),
+                )
+                await self._vectorstore.aadd_documents(self._documents)
+                # Counted once so documents persisted by earlier runs are included
+                self._doc_count = self._vectorstore._collection.count()
+                self._initialized = True
+                logger.info(f"Initialized ChromaDB at {self.persist_directory}")
             except Exception as e:
                 logger.warning(f"Failed to initialize vector store: {e}. Continuing without RAG.")
                 self._vectorstore = None
         elif self._vectorstore is not None:
             # Add to existing vectorstore
-            await self._vectorstore.aadd_documents([doc])
-        
+            await self._vectorstore.aadd_documents(docs)
+            self._doc_count += len(docs)
+
+    async def _add_to_faiss(self, docs: List[Document]) -> None:
+        try:
+            vectors = await self.embedding_manager.embed_documents(
+                [doc.page_content for doc in docs]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to embed documents: {e}. Continuing without RAG.")
+            return
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+
+        if self._index is None:
+            self._index = self._new_flat_index(vectors.shape[1])
+            self._initialized = True
+            logger.info(f"Initialized FAISS index (dim={vectors.shape[1]})")
+        elif self._mmap_path is not None:
+            # Mapped inverted lists cannot grow; read the index into memory once before writing
+            self._index = faiss.read_index(self._mmap_path)
+            self._index.nprobe = self._nprobe
+            self._mmap_path = None
+
+        start = len(self._documents)
+        self._index.add(vectors)
+        # Rows and documents stay in step even if the GPU replica below fails
+        self._documents.extend(docs)
+        self._filter_index = {}
+        for row, doc in enumerate(docs, start):
+            self._branch_ids.setdefault(doc.metadata.get("branch"), []).append(row)
+        if self._gpu_index is not None:
+            try:
+                self._gpu_index.add(vectors)
+            except Exception as e:
+                logger.warning(f"Failed to add vectors to the GPU index: {e}. Searching on CPU")
+                self._gpu_index = None
+                self.use_gpu = False
+        elif self.use_gpu:
+            self._gpu_index = self._clone_to_gpu(self._index)
+        self._maybe_upgrade_index()
+
+    def _new_flat_index(self, dim: int) -> faiss.Index:
+        # Narrower elements mean less memory streamed per query; scores are computed in float32
+        if self.vector_dtype == "float32":
+            return faiss.IndexFlatIP(dim)
+        if self.vector_dtype == "float16":
+            return faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT)
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit_uniform, faiss.METRIC_INNER_PRODUCT)
+        index.train(np.stack([np.full(dim, -1.0, dtype=np.float32), np.full(dim, 1.0, dtype=np.float32)]))
+        return index
+
+    def _maybe_upgrade_index(self) -> None:
+        # Exact search is fine for small trees; large corpora move to an inverted-file
+        # index with 8-bit scalar-quantized vectors (4x less memory scanned per query)
+        if isinstance(self._index, faiss.IndexIVF) or self._index.ntotal < IVF_THRESHOLD:
+            return
+
+        total = self._index.ntotal
+        dim = self._index.d
+        vectors = self._index.reconstruct_n(0, total)
+        nlist = max(1, int(math.sqrt(total)))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFScalarQuantizer(
+            quantizer, dim, nlist, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.add(vectors)
+        index.nprobe = self._nprobe or min(nlist, 16)
+        self._nprobe = index.nprobe
+        self._index = index
+        if self._gpu_index is not None:
+            self._gpu_index = self._clone_to_gpu(index)
+        logger.info(f"Switched FAISS index to IVF-SQ8 ({nlist} lists, {total} vectors)")
+
+    @property
+    def nprobe(self) -> Optional[int]:
+        return self._nprobe
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        # Lists scanned per IVF query: higher means better recall and slower search
+        self._nprobe = value
+        if isinstance(self._index, faiss.IndexIVF):
+            self._index.nprobe = value
+            if self._gpu_index is not None:
+                # The replica copies nprobe when cloned, so re-clone to apply the new value
+                self._gpu_index = self._clone_to_gpu(self._index)
+
+    def _clone_to_gpu(self, index: faiss.Index) -> Optional[faiss.Index]:
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("No FAISS GPU support available, searching on CPU")
+            self.use_gpu = False
+            return None
+
+        # Not every index type has a GPU implementation (flat scalar quantizers do not)
+        try:
+            options = faiss.GpuMultipleClonerOptions()
+            options.useFloat16 = True
+            gpu_index = faiss.index_cpu_to_all_gpus(index, co=options)
+        except Exception as e:
+            logger.warning(f"Failed to clone FAISS index to GPU: {e}. Searching on CPU")
+            self.use_gpu = False
+            return None
+        logger.info(f"Cloned FAISS index to {faiss.get_num_gpus()} GPU(s)")
+        return gpu_index
+
+    def _rows_with(self, key: str, value: Any) -> List[int]:
+        if key == "branch":
+            return self._branch_ids.get(value, [])
+        rows_by_value = self._filter_index.get(key)
+        if rows_by_value is None:
+            rows_by_value = {}
+            for row, doc in enumerate(self._documents):
+                rows_by_value.setdefault(doc.metadata.get(key), []).append(row)
+            self._filter_index[key] = rows_by_value
+        return rows_by_value.get(value, [])
+
+    def _matching_ids(self, filter: Dict[str, Any]) -> np.ndarray:
+        try:
+            # Filters on hashable values intersect precomputed row lists
+            # instead of testing every document on every query
+            ids: Optional[np.ndarray] = None
+            for key, value in filter.items():
+                rows = np.asarray(self._rows_with(key, value), dtype=np.int64)
+                ids = rows if ids is None else np.intersect1d(ids, rows, assume_unique=True)
+            return ids if ids is not None else np.arange(len(self._documents), dtype=np.int64)
+        except TypeError:
+            ids = [
+                row for row, doc in enumerate(self._documents)
+                if all(doc.metadata.get(key) == value for key, value in filter.items())
+            ]
+            return np.asarray(ids, dtype=np.int64)
+
+    def _search_params(
+        self,
+        filter: Optional[Dict[str, Any]],
+        exclude_branch: Optional[str],
+    ) -> Optional[faiss.SearchParameters]:
+        # Filtering happens inside FAISS during the scan, so exactly k matches come back
+        selectors = []
+        keep_alive = []
+        if filter:
+            selectors.append(faiss.IDSelectorBatch(self._matching_ids(filter)))
+        if exclude_branch is not None:
+            excluded = np.asarray(self._branch_ids.get(exclude_branch, []), dtype=np.int64)
+            keep_alive.append(faiss.IDSelectorBatch(excluded))
+            selectors.append(faiss.IDSelectorNot(keep_alive[-1]))
+        # The IVF index (and any GPU replica cloned from it) already carries nprobe
+        if not selectors:
+            return None
+
+        selector = None
+        if len(selectors) == 1:
+            selector = selectors[0]
+        elif len(selectors) == 2:
+            selector = faiss.IDSelectorAnd(*selectors)
+        keep_alive.extend(selectors)
+
+        if isinstance(self._index, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(nprobe=self._nprobe)
+        else:
+            params = faiss.SearchParameters()
+        if selector is not None:
+            params.sel = selector
+        # SWIG does not keep the selectors alive through the params object
+        params.referenced_objects = keep_alive
+        return params
+
+    def _query_buffer(self, rows: int, dim: int) -> np.ndarray:
+        if self._query_buf is None or self._query_buf.shape[0] < rows or self._query_buf.shape[1] != dim:
+            self._query_buf = np.empty((max(rows, QUERY_BUFFER_ROWS), dim), dtype=np.float32)
+        return self._query_buf[:rows]
+
+    def _search_vectors(
+        self,
+        queries: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+        exclude_branch: Optional[str] = None,
+    ) -> List[List[tuple[Document, float]]]:
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+
+        k = min(k, self._index.ntotal)
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        # Search runs synchronously, so the buffer is never shared between two searches
+        buffer = self._query_buffer(*queries.shape)
+        np.copyto(buffer, queries)
+        faiss.normalize_L2(buffer)
+        queries = buffer
+
+        params = self._search_params(filter, exclude_branch)
+        if params is None and self._gpu_index is not None:
+            scores, ids = self._gpu_index.search(queries, k)
+        else:
+            # Multi-GPU replicas reject search parameters, so filtered searches stay on CPU
+            scores, ids = self._index.search(queries, k, params=params)
+
+        return [
+            [
+                (self._documents[idx], float(score))
+                for score, idx in zip(row_scores, row_ids)
+                if idx >= 0
+            ]
+            for row_scores, row_ids in zip(scores, ids)
+        ]
+
+    async def index_leaf(self, leaf: Leaf, branch_name: str) -> None:
+        await self.index_leaves([(leaf, branch_name)])
         logger.debug(f"Indexed leaf: {leaf.name} in branch: {branch_name}")
 
-    async def index_branch(self, branch: Branch) -> None:
-        if self._vectorstore is None:
-            raise ValueError("Vector store not initialized")
+    async def index_leaves(self, leaves: List[Tuple[Leaf, str]]) -> None:
+        # One embedding batch for every (leaf, branch_name) pair
+        docs = [self._leaf_document(leaf, branch_name) for leaf, branch_name in leaves]
+        if docs:
+            await self._add_documents(docs)
 
-        for leaf in branch.get_leaves():
-            await self.index_leaf(leaf, branch.name)
+    def _branch_documents(self, branch: Branch) -> List[Document]:
+        # Paths are extended on the way down instead of walking parents for every leaf
+        docs: List[Document] = []
+        pending: List[Tuple[Branch, Tuple[str, ...]]] = [(branch, tuple(branch.get_path()))]
+        while pending:
+            current, current_path = pending.pop()
+            docs.extend(
+                self._leaf_document(leaf, current.name, "/".join(current_path + (leaf.name,)))
+                for leaf in current.get_leaves()
+            )
+            pending.extend(
+                (child, current_path + (child.name,)) for child in reversed(current.get_branches())
+            )
+        return docs
 
-        for sub_branch in branch.get_branches():
-            await self.index_branch(sub_branch)
+    async def index_branch(self, branch: Branch) -> None:
+        # Collect every leaf in the subtree first, then embed and add them in one batch
+        docs = self._branch_documents(branch)
+        if docs:
+            await self._add_documents(docs)
+        logger.debug(f"Indexed {len(docs)} leaves under branch: {branch.name}")
+
+    async def index_branches(self, branches: List[Branch]) -> None:
+        # Same as index_branch for each branch, but all leaves share one embedding batch
+        docs = [doc for branch in branches for doc in self._branch_documents(branch)]
+        if docs:
+            await self._add_documents(docs)
+        logger.debug(f"Indexed {len(docs)} leaves under {len(branches)} branches")
 
     async def similarity_search(
         self,
@@ -87,6 +406,10 @@ class GroupRAGStore:
         k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[Document]:
+        if self.use_faiss:
+            results = await self.similarity_search_with_score(query, k=k, filter=filter)
+            return [doc for doc, _ in results]
+
         if self._vectorstore is None:
             raise ValueError("Vector store not initialized")
 
@@ -103,10 +426,14 @@ class GroupRAGStore:
         k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[tuple[Document, float]]:
-        if self._vectorstore is None:
+        if not self._is_ready():
             raise ValueError("Vector store not initialized")
 
         try:
+            if self.use_faiss:
+                # Scores are cosine similarities (higher is more similar)
+                vector = await self.embedding_manager.embed_query(query)
+                return self._search_vectors(vector, k, filter)[0]
             results = await self._vectorstore.asimilarity_search_with_score(
                 query, k=k, filter=filter
             )
@@ -115,33 +442,93 @@ class GroupRAGStore:
             logger.error(f"Similarity search with score failed: {e}")
             return []
 
+    async def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[tuple[Document, float]]]:
+        if not self._is_ready():
+            raise ValueError("Vector store not initialized")
+        if not queries:
+            return []
+
+        if not self.use_faiss:
+            return list(await asyncio.gather(
+                *(self.similarity_search_with_score(query, k=k, filter=filter) for query in queries)
+            ))
+
+        try:
+            # One embedding call and one multi-row search for the whole batch
+            vectors = await self.embedding_manager.embed_documents(queries)
+            return self._search_vectors(vectors, k, filter)
+        except Exception as e:
+            logger.error(f"Batch similarity search failed: {e}")
+            return [[] for _ in queries]
+
     async def get_sibling_context(self, branch_name: str, query: str, k: int = 3) -> List[Document]:
+        if self.use_faiss:
+            if not self._is_ready():
+                raise ValueError("Vector store not initialized")
+            try:
+                vector = await self.embedding_manager.embed_query(query)
+                return [doc for doc, _ in self._search_vectors(vector, k, exclude_branch=branch_name)[0]]
+            except Exception as e:
+                logger.error(f"Sibling context search failed: {e}")
+                return []
+
         results = await self.similarity_search(query, k=k * 2)
         sibling_docs = [doc for doc in results if doc.metadata.get("branch") != branch_name]
         return sibling_docs[:k]
 
     def clear(self) -> None:
+        if self.use_faiss:
+            if self._index is not None:
+                for path in self._faiss_paths():
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._initialize_store()
+                logger.info("Cleared vector store")
+            return
+
         if self._vectorstore is not None:
             self._vectorstore.delete_collection()
             self._initialize_store()
             logger.info("Cleared vector store")
 
     def persist(self) -> None:
+        if self.use_faiss:
+            # Nothing changed since the mapped index was loaded
+            if self._index is None or self._mmap_path is not None:
+                return
+            os.makedirs(self.persist_directory, exist_ok=True)
+            index_path, documents_path = self._faiss_paths()
+            # Write then rename, so a reader never maps a half-written file
+            faiss.write_index(self._index, index_path + ".tmp")
+            with open(documents_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(
+                    [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in self._documents], f
+                )
+            os.replace(index_path + ".tmp", index_path)
+            os.replace(documents_path + ".tmp", documents_path)
+            logger.info(f"Persisted FAISS index to {self.persist_directory}")
+            return
+
         if self._vectorstore is not None:
             self._vectorstore.persist()
             logger.info("Persisted vector store")
 
     def get_stats(self) -> Dict[str, Any]:
-        if self._vectorstore is None:
+        if not self._is_ready():
             return {"error": "Vector store not initialized"}
 
-        try:
-            collection = self._vectorstore._collection
-            count = collection.count()
+        if self.use_faiss:
             return {
-                "total_documents": count,
-                "persist_directory": self.persist_directory,
+                "total_documents": self._index.ntotal,
+                "index_type": type(self._index).__name__,
             }
-        except Exception as e:
-            logger.error(f"Failed to get stats: {e}")
-            return {"error": str(e)}
+
+        return {
+            "total_documents": self._doc_count,
+            "persist_directory": self.persist_directory,
+        }
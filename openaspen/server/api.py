@@ -1,24 +1,37 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Union
 from openaspen import OpenAspenTree
 from openaspen.llm.providers import create_llm_config
+from openaspen.rag.cache import SemanticResponseCache
 import json
+import orjson
 from pathlib import Path
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
+# Request models ignore unknown fields (OpenAI clients send many) and skip
+# re-validating defaults, which keeps per-request validation cheap
+REQUEST_MODEL_CONFIG = ConfigDict(extra="ignore", str_strip_whitespace=False, validate_default=False)
+
+
 class ChatMessage(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     role: str
     content: str
 
 
 class ChatCompletionRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     model: str = "openaspen"
-    messages: List[ChatMessage]
+    messages: List[ChatMessage] = Field(min_length=1)
     temperature: float = 0.7
     max_tokens: int = 2000
     stream: bool = False
@@ -27,10 +40,12 @@ class ChatCompletionRequest(BaseModel):
 class ChatCompletionResponse(BaseModel):
     id: str = "chatcmpl-openaspen"
     object: str = "chat.completion"
-    created: int = Field(default_factory=lambda: int(__import__("time").time()))
+    created: int = Field(default_factory=lambda: int(time.time()))
     model: str = "openaspen"
     choices: List[Dict[str, Any]]
-    usage: Dict[str, int] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    usage: Dict[str, int] = Field(
+        default_factory=lambda: {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    )
 
 
 class TreeInfo(BaseModel):
@@ -39,7 +54,46 @@ class TreeInfo(BaseModel):
     llm_providers: List[str]
 
 
-def create_app(config_file: Optional[str] = None) -> FastAPI:
+def _format_result(result: Any) -> str:
+    if isinstance(result, dict):
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+    return str(result)
+
+
+def _completion_chunk(model: str, created: int, delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+    chunk = {
+        "id": "chatcmpl-openaspen",
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {orjson.dumps(chunk).decode()}\n\n"
+
+
+async def _stream_completion(
+    complete: Callable[[str], Awaitable[str]], message: str, model: str
+) -> AsyncIterator[str]:
+    created = int(time.time())
+    # Sent before execution starts so clients get the first event without waiting on the tree
+    yield _completion_chunk(model, created, {"role": "assistant"})
+
+    try:
+        content = await complete(message)
+    except Exception as e:
+        logger.error(f"Chat completion failed: {e}")
+        yield f"data: {orjson.dumps({'error': {'message': str(e)}}).decode()}\n\n"
+    else:
+        yield _completion_chunk(model, created, {"content": content})
+        yield _completion_chunk(model, created, {}, finish_reason="stop")
+
+    yield "data: [DONE]\n\n"
+
+
+def create_app(
+    config_file: Optional[str] = None,
+    response_cache_threshold: Optional[float] = None,
+) -> FastAPI:
     app = FastAPI(
         title="OpenAspen API",
         description="OpenAI-compatible API for OpenAspen tree-structured agents",
@@ -64,6 +118,25 @@ def create_app(config_file: Optional[str] = None) -> FastAPI:
         tree = OpenAspenTree.from_dict(config_data, llm_configs)
         logger.info(f"Loaded tree from {config_file}")
 
+    # Opt-in: near-duplicate prompts reuse an earlier answer instead of re-running the tree
+    response_cache: Optional[SemanticResponseCache] = None
+    if response_cache_threshold is not None and tree is not None and tree.embedding_manager is not None:
+        response_cache = SemanticResponseCache(tree.embedding_manager, threshold=response_cache_threshold)
+
+    async def complete(message: str) -> str:
+        if response_cache is not None:
+            cached = await response_cache.get(message)
+            if cached is not None:
+                return cached
+
+        result = await tree.execute(message)
+        content = _format_result(result)
+
+        # Failed executions are not cached so the next request retries
+        if response_cache is not None and not (isinstance(result, dict) and result.get("success") is False):
+            await response_cache.set(message, content)
+        return content
+
     @app.get("/")
     async def root() -> Dict[str, str]:
         return {
@@ -86,17 +159,27 @@ def create_app(config_file: Optional[str] = None) -> FastAPI:
             ],
         }
 
-    @app.post("/v1/chat/completions")
-    async def chat_completions(request: ChatCompletionRequest) -> ChatCompletionResponse:
+    @app.post("/v1/chat/completions", response_model=None)
+    async def chat_completions(
+        request: ChatCompletionRequest,
+    ) -> Union[ChatCompletionResponse, StreamingResponse]:
         if tree is None:
             raise HTTPException(status_code=500, detail="Tree not initialized")
 
-        try:
-            last_message = request.messages[-1].content if request.messages else ""
+        # An empty prompt would run the tree (and fill the response cache) for nothing
+        last_message = request.messages[-1].content
+        if not last_message.strip():
+            raise HTTPException(status_code=400, detail="messages must contain non-empty content")
 
-            result = await tree.execute(last_message)
+        if request.stream:
+            return StreamingResponse(
+                _stream_completion(complete, last_message, request.model),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"},
+            )
 
-            response_content = json.dumps(result) if isinstance(result, dict) else str(result)
+        try:
+            response_content = await complete(last_message)
 
             return ChatCompletionResponse(
                 model=request.model,
@@ -7,6 +7,8 @@ from fastapi.responses import PlainTextResponse
 import logging
 from typing import Optional
 
+import orjson
+
 from openaspen.integrations.gateway import MessageGateway
 from openaspen.integrations.base import MessagePlatform, IncomingMessage
 
@@ -31,7 +33,7 @@ async def telegram_webhook(request: Request):
         raise HTTPException(status_code=503, detail="Message gateway not initialized")
     
     try:
-        payload = await request.json()
+        payload = orjson.loads(await request.body())
         logger.debug(f"Telegram webhook payload: {payload}")
         
         # Get Telegram handler
@@ -39,6 +41,11 @@ async def telegram_webhook(request: Request):
         if not telegram_handler:
             raise HTTPException(status_code=503, detail="Telegram handler not registered")
         
+        # In webhook mode the bot's own handlers take the update
+        if getattr(telegram_handler, "webhook_mode", False):
+            await telegram_handler.process_update(payload)
+            return {"status": "ok"}
+        
         # Parse incoming message
         message = await telegram_handler.handle_webhook(payload)
         
@@ -93,7 +100,7 @@ async def whatsapp_webhook(request: Request):
         raise HTTPException(status_code=503, detail="Message gateway not initialized")
     
     try:
-        payload = await request.json()
+        payload = orjson.loads(await request.body())
         logger.debug(f"WhatsApp webhook payload: {payload}")
         
         # Get WhatsApp handler
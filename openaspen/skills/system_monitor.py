@@ -2,28 +2,118 @@
 System monitoring utilities for Linux
 Collects CPU, memory, disk, network, and process information
 """
+import asyncio
 import psutil
 import platform
-from typing import Dict, List, Any
+import functools
+import heapq
+import time
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+# Seconds a metrics snapshot is reused, so one report (or alert check) samples once
+CACHE_TTL = 2.0
+
+# Seconds the mounted partition list is reused; mounts rarely change between reports
+PARTITION_CACHE_TTL = 60.0
+
+# Virtual filesystems whose usage says nothing about real disk space
+PSEUDO_FILESYSTEMS = frozenset({"tmpfs", "devtmpfs", "squashfs", "overlay"})
+
+# Fixed layout of format_report_for_llm; the variable-length sections are pre-joined
+REPORT_TEMPLATE = (
+    "=== LINUX SYSTEM HEALTH REPORT ===\n\n"
+    "System: {hostname} ({os} {os_version})\n"
+    "Uptime: {uptime_hours} hours\n"
+    "Architecture: {architecture}\n\n"
+    "CPU Usage: {cpu_percent}%\n"
+    "CPU Cores: {count_physical} physical, {count_logical} logical\n"
+    "{load_average}"
+    "Memory: {used_gb}GB / {total_gb}GB ({mem_percent}%)\n"
+    "Swap: {swap_used_gb}GB / {swap_total_gb}GB ({swap_percent}%)\n\n"
+    "Disk Usage:\n"
+    "{partitions}\n"
+    "Network: Sent {bytes_sent_mb}MB, Received {bytes_recv_mb}MB\n"
+    "Active Connections: {active_connections}\n\n"
+    "Top 10 Processes by CPU:"
+    "{processes}"
+)
+
+# Per-row layouts for the variable-length sections, filled straight from the metric dicts
+PARTITION_LINE = "  {mountpoint}: {used_gb}GB / {total_gb}GB ({percent_used}%)\n"
+PROCESS_LINE = "\n  {0}. {1[name]} (PID {1[pid]}): CPU {1[cpu_percent]}%, MEM {1[memory_percent]}%"
+
+# Prime psutil's CPU counters so later non-blocking reads measure since this point
+psutil.cpu_percent(interval=None)
+psutil.cpu_percent(interval=None, percpu=True)
+
+
+def _ttl_cached(func: Callable[[], Dict[str, Any]]) -> Callable[[], Dict[str, Any]]:
+    """Reuse a metrics snapshot for CACHE_TTL seconds (returns a shallow copy)"""
+    cached: Dict[str, Any] = {}
+    
+    @functools.wraps(func)
+    def wrapper() -> Dict[str, Any]:
+        now = time.monotonic()
+        if not cached or now >= cached["expires"]:
+            cached["value"] = func()
+            cached["expires"] = now + CACHE_TTL
+        return dict(cached["value"])
+    
+    return wrapper
+
 
 class SystemMonitor:
     """Collects and formats Linux system metrics"""
     
+    _partition_cache: Optional[List[Any]] = None
+    _partition_cache_ts = 0.0
+    _last_disk_io: Optional[Tuple[float, Any]] = None
+    
+    @classmethod
+    def _get_partitions(cls) -> List[Any]:
+        """Get real disk partitions, re-listing mounts at most every PARTITION_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if cls._partition_cache is None or now - cls._partition_cache_ts >= PARTITION_CACHE_TTL:
+            # Container roots are overlay mounts, so "/" is always kept
+            cls._partition_cache = [
+                p for p in psutil.disk_partitions()
+                if p.fstype not in PSEUDO_FILESYSTEMS or p.mountpoint == "/"
+            ]
+            cls._partition_cache_ts = now
+        return cls._partition_cache
+    
+    @classmethod
+    def _get_disk_io_rates(cls, disk_io: Any) -> Tuple[Optional[float], Optional[float]]:
+        """Get read/write MB per second since the previous call"""
+        now = time.monotonic()
+        previous, cls._last_disk_io = cls._last_disk_io, (now, disk_io)
+        if previous is None or disk_io is None or previous[1] is None or now <= previous[0]:
+            return None, None
+        elapsed = now - previous[0]
+        return (
+            round((disk_io.read_bytes - previous[1].read_bytes) / (1024**2) / elapsed, 2),
+            round((disk_io.write_bytes - previous[1].write_bytes) / (1024**2) / elapsed, 2),
+        )
+    
     @staticmethod
+    @_ttl_cached
     def get_cpu_info() -> Dict[str, Any]:
         """Get CPU usage and information"""
+        # Non-blocking: usage since the previous read, overall derived from the same sample
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        freq = psutil.cpu_freq()
         return {
-            "usage_percent": psutil.cpu_percent(interval=1),
-            "usage_per_cpu": psutil.cpu_percent(interval=1, percpu=True),
+            "usage_percent": round(sum(per_cpu) / len(per_cpu), 1) if per_cpu else 0.0,
+            "usage_per_cpu": per_cpu,
             "count_physical": psutil.cpu_count(logical=False),
             "count_logical": psutil.cpu_count(logical=True),
-            "frequency_mhz": psutil.cpu_freq().current if psutil.cpu_freq() else None,
+            "frequency_mhz": freq.current if freq else None,
             "load_average": psutil.getloadavg() if hasattr(psutil, "getloadavg") else None,
         }
     
     @staticmethod
+    @_ttl_cached
     def get_memory_info() -> Dict[str, Any]:
         """Get memory usage information"""
         mem = psutil.virtual_memory()
@@ -40,10 +130,11 @@ class SystemMonitor:
         }
     
     @staticmethod
+    @_ttl_cached
     def get_disk_info() -> Dict[str, Any]:
         """Get disk usage information"""
         partitions = []
-        for partition in psutil.disk_partitions():
+        for partition in SystemMonitor._get_partitions():
             try:
                 usage = psutil.disk_usage(partition.mountpoint)
                 partitions.append({
@@ -55,17 +146,22 @@ class SystemMonitor:
                     "free_gb": round(usage.free / (1024**3), 2),
                     "percent_used": usage.percent,
                 })
-            except PermissionError:
+            except (PermissionError, FileNotFoundError):
+                # Mount went away since the partition list was cached
                 continue
         
-        disk_io = psutil.disk_io_counters()
+        disk_io = psutil.disk_io_counters(nowrap=True)
+        read_rate, write_rate = SystemMonitor._get_disk_io_rates(disk_io)
         return {
             "partitions": partitions,
             "io_read_mb": round(disk_io.read_bytes / (1024**2), 2) if disk_io else None,
             "io_write_mb": round(disk_io.write_bytes / (1024**2), 2) if disk_io else None,
+            "io_read_mb_per_s": read_rate,
+            "io_write_mb_per_s": write_rate,
         }
     
     @staticmethod
+    @_ttl_cached
     def get_network_info() -> Dict[str, Any]:
         """Get network statistics"""
         net_io = psutil.net_io_counters()
@@ -82,22 +178,24 @@ class SystemMonitor:
     @staticmethod
     def get_top_processes(limit: int = 10) -> List[Dict[str, Any]]:
         """Get top processes by CPU and memory usage"""
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
-            try:
-                processes.append({
-                    "pid": proc.info['pid'],
-                    "name": proc.info['name'],
-                    "cpu_percent": proc.info['cpu_percent'],
-                    "memory_percent": round(proc.info['memory_percent'], 2),
-                    "status": proc.info['status'],
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+        # Keep only the top `limit` while streaming instead of sorting every process
+        top = heapq.nlargest(
+            limit,
+            psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']),
+            key=lambda proc: proc.info['cpu_percent'] or 0,
+        )
         
-        # Sort by CPU usage
-        processes.sort(key=lambda x: x['cpu_percent'] or 0, reverse=True)
-        return processes[:limit]
+        processes = []
+        for proc in top:
+            memory_percent = proc.info['memory_percent']
+            processes.append({
+                "pid": proc.info['pid'],
+                "name": proc.info['name'],
+                "cpu_percent": proc.info['cpu_percent'],
+                "memory_percent": round(memory_percent, 2) if memory_percent is not None else None,
+                "status": proc.info['status'],
+            })
+        return processes
     
     @staticmethod
     def get_system_info() -> Dict[str, Any]:
@@ -131,74 +229,66 @@ class SystemMonitor:
     @classmethod
     def format_report_for_llm(cls) -> str:
         """Format system report in a human-readable way for LLM analysis"""
-        report = cls.get_full_report()
-        
-        output = []
-        output.append("=== LINUX SYSTEM HEALTH REPORT ===\n")
-        
-        # System Info
-        sys = report['system']
-        output.append(f"System: {sys['hostname']} ({sys['os']} {sys['os_version']})")
-        output.append(f"Uptime: {sys['uptime_hours']} hours")
-        output.append(f"Architecture: {sys['architecture']}\n")
-        
-        # CPU
-        cpu = report['cpu']
-        output.append(f"CPU Usage: {cpu['usage_percent']}%")
-        output.append(f"CPU Cores: {cpu['count_physical']} physical, {cpu['count_logical']} logical")
-        if cpu['load_average']:
-            output.append(f"Load Average: {cpu['load_average']}\n")
-        
-        # Memory
-        mem = report['memory']
-        output.append(f"Memory: {mem['used_gb']}GB / {mem['total_gb']}GB ({mem['percent_used']}%)")
-        output.append(f"Swap: {mem['swap_used_gb']}GB / {mem['swap_total_gb']}GB ({mem['swap_percent']}%)\n")
-        
-        # Disk
-        disk = report['disk']
-        output.append("Disk Usage:")
-        for part in disk['partitions']:
-            output.append(f"  {part['mountpoint']}: {part['used_gb']}GB / {part['total_gb']}GB ({part['percent_used']}%)")
-        output.append("")
-        
-        # Network
-        net = report['network']
-        output.append(f"Network: Sent {net['bytes_sent_mb']}MB, Received {net['bytes_recv_mb']}MB")
-        output.append(f"Active Connections: {net['active_connections']}\n")
-        
-        # Top Processes
-        output.append("Top 10 Processes by CPU:")
-        for i, proc in enumerate(report['top_processes'], 1):
-            output.append(f"  {i}. {proc['name']} (PID {proc['pid']}): CPU {proc['cpu_percent']}%, MEM {proc['memory_percent']}%")
+        system = cls.get_system_info()
+        cpu = cls.get_cpu_info()
+        mem = cls.get_memory_info()
+        disk = cls.get_disk_info()
+        net = cls.get_network_info()
         
-        return "\n".join(output)
+        return REPORT_TEMPLATE.format_map({
+            "hostname": system['hostname'],
+            "os": system['os'],
+            "os_version": system['os_version'],
+            "uptime_hours": system['uptime_hours'],
+            "architecture": system['architecture'],
+            "cpu_percent": cpu['usage_percent'],
+            "count_physical": cpu['count_physical'],
+            "count_logical": cpu['count_logical'],
+            "load_average": f"Load Average: {cpu['load_average']}\n\n" if cpu['load_average'] else "",
+            "used_gb": mem['used_gb'],
+            "total_gb": mem['total_gb'],
+            "mem_percent": mem['percent_used'],
+            "swap_used_gb": mem['swap_used_gb'],
+            "swap_total_gb": mem['swap_total_gb'],
+            "swap_percent": mem['swap_percent'],
+            "partitions": "".join(map(PARTITION_LINE.format_map, disk['partitions'])),
+            "bytes_sent_mb": net['bytes_sent_mb'],
+            "bytes_recv_mb": net['bytes_recv_mb'],
+            "active_connections": net['active_connections'],
+            "processes": "".join(
+                PROCESS_LINE.format(i, proc)
+                for i, proc in enumerate(cls.get_top_processes(limit=10), 1)
+            ),
+        })
 
 
 async def monitor_system_health() -> str:
     """Async wrapper for system monitoring"""
-    return SystemMonitor.format_report_for_llm()
+    return await asyncio.to_thread(SystemMonitor.format_report_for_llm)
 
 
 async def get_cpu_status() -> Dict[str, Any]:
     """Get just CPU information"""
-    return SystemMonitor.get_cpu_info()
+    return await asyncio.to_thread(SystemMonitor.get_cpu_info)
 
 
 async def get_memory_status() -> Dict[str, Any]:
     """Get just memory information"""
-    return SystemMonitor.get_memory_info()
+    return await asyncio.to_thread(SystemMonitor.get_memory_info)
 
 
 async def get_disk_status() -> Dict[str, Any]:
     """Get just disk information"""
-    return SystemMonitor.get_disk_info()
+    return await asyncio.to_thread(SystemMonitor.get_disk_info)
 
 
 async def check_system_alerts() -> Dict[str, Any]:
     """Check for system issues that need attention"""
-    cpu = SystemMonitor.get_cpu_info()
-    mem = SystemMonitor.get_memory_info()
-    disk = SystemMonitor.get_disk_info()
+    cpu, mem, disk = await asyncio.gather(
+        asyncio.to_thread(SystemMonitor.get_cpu_info),
+        asyncio.to_thread(SystemMonitor.get_memory_info),
+        asyncio.to_thread(SystemMonitor.get_disk_info),
+    )
     
     alerts = []
     
@@ -2,16 +2,29 @@ import logging
 import sys
 from typing import Optional
 
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
 
 def setup_logging(level: Optional[str] = None) -> None:
-    log_level = level or "INFO"
-    
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
-    logging.getLogger("openaspen").setLevel(getattr(logging, log_level.upper()))
+    log_level = (level or "INFO").upper()
+    try:
+        numeric_level = _LEVELS[log_level]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level}") from None
+
+    # basicConfig is a no-op once the root logger has handlers, so a second call
+    # would silently keep the old level; configure the root logger directly instead
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        root.addHandler(handler)
+    root.setLevel(numeric_level)
+
+    logging.getLogger("openaspen").setLevel(numeric_level)
@@ -4,12 +4,21 @@ OpenAspen Setup Script
 Automated setup for new users to get started quickly
 """
 
+import argparse
+import hashlib
+import json
 import subprocess
 import sys
 import os
 from pathlib import Path
 import shutil
 
+# Local state for repeat runs (lock hash of the last install, last Poetry check)
+CACHE_DIR = Path(".openaspen-setup-cache")
+STATE_PATH = CACHE_DIR / "state.json"
+
+PROFILES = ["minimal", "hub-tools", "full"]
+
 
 class Colors:
     HEADER = '\033[95m'
@@ -45,22 +54,40 @@ def print_error(text):
 
 
 def run_command(cmd, check=True, capture_output=False):
-    """Run a shell command"""
+    """Run a command given as an argument list (a string is run through the shell)"""
+    # Argument lists are executed directly: no /bin/sh process and no quoting issues
+    shell = isinstance(cmd, str)
     try:
         if capture_output:
             result = subprocess.run(
-                cmd, shell=True, check=check, capture_output=True, text=True
+                cmd, shell=shell, check=check, capture_output=True, text=True
             )
             return result.stdout.strip()
         else:
-            subprocess.run(cmd, shell=True, check=check)
+            subprocess.run(cmd, shell=shell, check=check)
             return True
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # FileNotFoundError: executable missing (the shell used to report this as exit code 127)
         if check:
             raise
         return False
 
 
+def run_long_command(cmd):
+    """Run a long command with its output live on the terminal, letting it finish on Ctrl+C"""
+    process = subprocess.Popen(cmd)
+    try:
+        returncode = process.wait()
+    except KeyboardInterrupt:
+        # The child received the same SIGINT; wait for it to clean up instead of
+        # killing it mid-write (subprocess.run kills it after 0.25s)
+        print_warning("Interrupted, waiting for the command to stop...")
+        process.wait()
+        raise
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
 def check_python_version():
     """Check if Python version is 3.11+"""
     print_info("Checking Python version...")
@@ -73,22 +100,53 @@ def check_python_version():
         return False
 
 
+def load_state():
+    """Load results of earlier successful checks"""
+    try:
+        return json.loads(STATE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    """Persist check results for the next run"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    STATE_PATH.write_text(json.dumps(state))
+
+
 def check_poetry():
     """Check if Poetry is installed"""
     print_info("Checking for Poetry...")
-    try:
-        version = run_command("poetry --version", capture_output=True)
-        print_success(f"Poetry installed: {version}")
+    poetry_path = shutil.which("poetry")
+    if not poetry_path:
+        print_warning("Poetry not found")
+        return False
+    
+    # Reuse the last version probe while the interpreter and the poetry executable are unchanged
+    key = f"{sys.version}|{poetry_path}|{os.stat(poetry_path).st_mtime_ns}"
+    state = load_state()
+    if state.get("poetry_key") == key:
+        print_success(f"Poetry installed: {state['poetry_version']}")
         return True
+    
+    try:
+        # --no-plugins skips plugin loading, which dominates a bare version check
+        version = run_command(["poetry", "--no-plugins", "--version"], capture_output=True)
     except:
         print_warning("Poetry not found")
         return False
+    
+    print_success(f"Poetry installed: {version}")
+    state.update(poetry_key=key, poetry_version=version)
+    save_state(state)
+    return True
 
 
 def install_poetry():
     """Install Poetry"""
     print_info("Installing Poetry...")
     try:
+        # The installer is piped into Python, so this one needs a shell
         run_command("curl -sSL https://install.python-poetry.org | python3 -")
         print_success("Poetry installed successfully")
         print_warning("You may need to restart your shell or run: source ~/.bashrc")
@@ -99,27 +157,54 @@ def install_poetry():
         return False
 
 
+def dependencies_hash(profile):
+    """Hash the lock file (or pyproject.toml without one) together with the profile"""
+    lock_path = Path("poetry.lock")
+    if not lock_path.exists():
+        lock_path = Path("pyproject.toml")
+    digest = hashlib.blake2b(lock_path.read_bytes(), digest_size=16)
+    digest.update(profile.encode())
+    return digest.hexdigest()
+
+
+def poetry_env_exists():
+    """Check that Poetry's virtualenv for this project is still on disk"""
+    path = run_command(
+        ["poetry", "--no-plugins", "env", "info", "--path"], check=False, capture_output=True
+    )
+    return bool(path) and Path(path).exists()
+
+
 def install_dependencies(profile="minimal"):
     """Install project dependencies"""
     print_info(f"Installing dependencies (profile: {profile})...")
     
+    hash_path = CACHE_DIR / "lock.hash"
+    lock_hash = dependencies_hash(profile)
+    if hash_path.exists() and hash_path.read_text().strip() == lock_hash and poetry_env_exists():
+        print_success("Dependencies already up to date (lock hash match)")
+        return True
+    
     profiles = {
         "minimal": [],
         "hub-tools": ["--extras", "hub-tools"],
-        "full": ["--extras", "hub-tools", "--with", "dev"],
+        "full": ["--extras", "hub-tools", "--extras", "speedups", "--with", "dev"],
     }
     
-    cmd_parts = ["poetry", "install"]
-    cmd_parts.extend(profiles.get(profile, []))
-    cmd = " ".join(cmd_parts)
+    cmd = ["poetry", "install", "--no-interaction"]
+    cmd.extend(profiles.get(profile, []))
     
+    print_info(f"Running: {' '.join(cmd)} (this can take a few minutes)")
     try:
-        run_command(cmd)
+        run_long_command(cmd)
         print_success("Dependencies installed successfully")
-        return True
     except:
         print_error("Failed to install dependencies")
         return False
+    
+    CACHE_DIR.mkdir(exist_ok=True)
+    hash_path.write_text(lock_hash)
+    return True
 
 
 def create_env_file():
@@ -206,7 +291,7 @@ def run_tests():
     """Run the test suite"""
     print_info("Running tests...")
     try:
-        run_command("poetry run pytest tests/test_langchain_hub.py -v")
+        run_command(["poetry", "run", "pytest", "tests/test_langchain_hub.py", "-v"])
         print_success("All tests passed!")
         return True
     except:
@@ -218,35 +303,53 @@ def print_next_steps():
     """Print next steps for the user"""
     print_header("🎉 Setup Complete!")
     
-    print(f"{Colors.BOLD}Next Steps:{Colors.ENDC}\n")
-    
-    print(f"{Colors.OKCYAN}1. Add your API keys to .env:{Colors.ENDC}")
-    print(f"   nano .env  # or use your favorite editor\n")
-    
-    print(f"{Colors.OKCYAN}2. Try the quickstart examples:{Colors.ENDC}")
-    print(f"   poetry run python examples/degen_quickstart.py")
-    print(f"   poetry run python examples/langchain_hub_example.py\n")
-    
-    print(f"{Colors.OKCYAN}3. Use the CLI:{Colors.ENDC}")
-    print(f"   poetry run openaspen grow_leaf --list-tools")
-    print(f"   poetry run openaspen visualize my_tree.json")
-    print(f"   poetry run openaspen run my_tree.json -q 'Hello!'\n")
-    
-    print(f"{Colors.OKCYAN}4. Read the documentation:{Colors.ENDC}")
-    print(f"   docs/QUICKSTART_LANGCHAIN_HUB.md")
-    print(f"   docs/LANGCHAIN_HUB_INTEGRATION.md\n")
-    
-    print(f"{Colors.BOLD}Quick Commands:{Colors.ENDC}\n")
-    print(f"  List hub tools:  poetry run openaspen grow_leaf --list-tools")
-    print(f"  Run tests:       poetry run pytest")
-    print(f"  Format code:     poetry run black .")
-    print(f"  Type check:      poetry run mypy openaspen\n")
-    
-    print(f"{Colors.OKGREEN}Happy building! 🌲{Colors.ENDC}\n")
-
-
-def main():
+    # One write for the whole block, so it cannot interleave with other output
+    sys.stdout.write(
+        f"{Colors.BOLD}Next Steps:{Colors.ENDC}\n\n"
+        f"{Colors.OKCYAN}1. Add your API keys to .env:{Colors.ENDC}\n"
+        "   nano .env  # or use your favorite editor\n\n"
+        f"{Colors.OKCYAN}2. Try the quickstart examples:{Colors.ENDC}\n"
+        "   poetry run python examples/degen_quickstart.py\n"
+        "   poetry run python examples/langchain_hub_example.py\n\n"
+        f"{Colors.OKCYAN}3. Use the CLI:{Colors.ENDC}\n"
+        "   poetry run openaspen grow_leaf --list-tools\n"
+        "   poetry run openaspen visualize my_tree.json\n"
+        "   poetry run openaspen run my_tree.json -q 'Hello!'\n\n"
+        f"{Colors.OKCYAN}4. Read the documentation:{Colors.ENDC}\n"
+        "   docs/QUICKSTART_LANGCHAIN_HUB.md\n"
+        "   docs/LANGCHAIN_HUB_INTEGRATION.md\n\n"
+        f"{Colors.BOLD}Quick Commands:{Colors.ENDC}\n\n"
+        "  List hub tools:  poetry run openaspen grow_leaf --list-tools\n"
+        "  Run tests:       poetry run pytest\n"
+        "  Format code:     poetry run black .\n"
+        "  Type check:      poetry run mypy openaspen\n\n"
+        f"{Colors.OKGREEN}Happy building! 🌲{Colors.ENDC}\n\n"
+    )
+    sys.stdout.flush()
+
+
+def parse_args(argv=None):
+    """Parse the flags that make setup non-interactive"""
+    parser = argparse.ArgumentParser(description="Set up OpenAspen for development")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="Answer yes to every prompt (install Poetry, run tests)")
+    parser.add_argument("--profile", choices=PROFILES,
+                        help="Installation profile (default: hub-tools)")
+    parser.add_argument("--skip-tests", action="store_true", help="Do not run the test suite")
+    return parser.parse_args(argv)
+
+
+def require_tty(flags):
+    """Exit with a hint instead of blocking on a prompt nobody can answer"""
+    if not sys.stdin.isatty():
+        print_error(f"No terminal to prompt on; pass {flags} to run non-interactively")
+        sys.exit(2)
+
+
+def main(argv=None):
     """Main setup flow"""
+    args = parse_args(argv)
+    
     print_header("🌲 OpenAspen Setup")
     
     print(f"{Colors.BOLD}This script will set up OpenAspen for development.{Colors.ENDC}\n")
@@ -259,7 +362,11 @@ def main():
     # Check/install Poetry
     has_poetry = check_poetry()
     if not has_poetry:
-        response = input("\nInstall Poetry automatically? [y/N]: ").strip().lower()
+        if args.yes:
+            response = 'y'
+        else:
+            require_tty("--yes")
+            response = input("\nInstall Poetry automatically? [y/N]: ").strip().lower()
         if response == 'y':
             if not install_poetry():
                 sys.exit(1)
@@ -268,14 +375,20 @@ def main():
             sys.exit(1)
     
     # Ask for installation profile
-    print(f"\n{Colors.BOLD}Choose installation profile:{Colors.ENDC}")
-    print(f"  1. Minimal (core only)")
-    print(f"  2. Hub Tools (core + LangChain Hub tools)")
-    print(f"  3. Full (everything including dev tools)")
-    
-    profile_choice = input("\nEnter choice [1-3] (default: 2): ").strip() or "2"
-    profile_map = {"1": "minimal", "2": "hub-tools", "3": "full"}
-    profile = profile_map.get(profile_choice, "hub-tools")
+    if args.profile:
+        profile = args.profile
+    elif args.yes:
+        profile = "hub-tools"
+    else:
+        require_tty("--profile {minimal,hub-tools,full} or --yes")
+        print(f"\n{Colors.BOLD}Choose installation profile:{Colors.ENDC}")
+        print(f"  1. Minimal (core only)")
+        print(f"  2. Hub Tools (core + LangChain Hub tools)")
+        print(f"  3. Full (everything including dev tools)")
+        
+        profile_choice = input("\nEnter choice [1-3] (default: 2): ").strip() or "2"
+        profile_map = {"1": "minimal", "2": "hub-tools", "3": "full"}
+        profile = profile_map.get(profile_choice, "hub-tools")
     
     # Install dependencies
     if not install_dependencies(profile):
@@ -288,10 +401,13 @@ def main():
     create_example_tree()
     
     # Run tests (optional)
-    if profile == "full":
-        response = input("\nRun tests? [y/N]: ").strip().lower()
-        if response == 'y':
+    if profile == "full" and not args.skip_tests:
+        if args.yes:
             run_tests()
+        elif sys.stdin.isatty():
+            response = input("\nRun tests? [y/N]: ").strip().lower()
+            if response == 'y':
+                run_tests()
     
     # Print next steps
     print_next_steps()
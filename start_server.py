@@ -10,49 +10,57 @@ Usage:
 """
 
 import asyncio
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from time import time as _now
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Literal, Optional
 import os
 import argparse
 import logging
 
-from openaspen import OpenAspenTree
-from openaspen.llm.providers import create_llm_config
-from openaspen.integrations.langchain_hub import LangChainHubLoader
+# FastAPI, uvicorn and openaspen are imported where they are used, so --help
+# and early exits do not pay for loading them
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from openaspen import OpenAspenTree
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+try:
+    import uvloop
+except ImportError:  # Optional speedup; the default asyncio loop works too
+    uvloop = None
 
+logger = logging.getLogger(__name__)
 
-class ChatMessage(BaseModel):
-    role: str
-    content: str
+# Survives restarts (including --reload), so leaf texts embedded by a previous run are reused
+RUNTIME_DIR = os.getenv("OPENASPEN_RUNTIME_DIR", ".openaspen-runtime")
 
 
-class ChatCompletionRequest(BaseModel):
-    model: str = "openaspen"
-    messages: List[ChatMessage]
-    temperature: float = 0.7
-    max_tokens: int = 2000
+# Search clients are created on first use and shared, so repeated searches reuse
+# one HTTP session instead of opening a new connection pool per call
+_ddgs = None
+_wikipedia = None
 
 
-class ChatCompletionResponse(BaseModel):
-    id: str = "chatcmpl-openaspen"
-    object: str = "chat.completion"
-    created: int
-    model: str
-    choices: List[Dict[str, Any]]
+def _get_ddgs():
+    global _ddgs
+    if _ddgs is None:
+        from duckduckgo_search import DDGS
+        _ddgs = DDGS()
+    return _ddgs
 
 
-class QueryRequest(BaseModel):
-    query: str
+def _get_wikipedia():
+    global _wikipedia
+    if _wikipedia is None:
+        import wikipedia
+        wikipedia.set_lang("en")
+        _wikipedia = wikipedia
+    return _wikipedia
 
 
-def create_tree(use_grok: bool = False, use_openai: bool = False) -> OpenAspenTree:
+def create_tree(use_grok: bool = False, use_openai: bool = False) -> "OpenAspenTree":
     """Create OpenAspen tree with LM Studio and optional cloud LLMs"""
+    from openaspen import OpenAspenTree
+    from openaspen.llm.providers import create_llm_config
+    from openaspen.rag.embeddings import EmbeddingManager
     
     llm_configs = {
         "lmstudio": create_llm_config(
@@ -89,11 +97,18 @@ def create_tree(use_grok: bool = False, use_openai: bool = False) -> OpenAspenTr
         else:
             logger.warning("⚠️  OPENAI_API_KEY not found in environment")
     
-    # Create tree with fake embeddings (no API key needed)
+    # Create tree with fake embeddings (no API key needed). The embedding cache is
+    # keyed by provider and model, so changing either re-embeds instead of reusing
+    os.makedirs(RUNTIME_DIR, exist_ok=True)
+    embedding_manager = EmbeddingManager(
+        provider="fake",
+        cache_path=os.path.join(RUNTIME_DIR, "embeddings.sqlite"),
+    )
     tree = OpenAspenTree(
         name="openaspen_server",
         llm_configs=llm_configs,
-        use_embeddings=True,  # Uses fake embeddings by default
+        embedding_manager=embedding_manager,
+        use_embeddings=True,
     )
     
     logger.info(f"🌲 Created tree with providers: {list(llm_configs.keys())}")
@@ -101,7 +116,7 @@ def create_tree(use_grok: bool = False, use_openai: bool = False) -> OpenAspenTr
     return tree
 
 
-async def setup_tree(tree: OpenAspenTree) -> None:
+async def setup_tree(tree: "OpenAspenTree") -> None:
     """Setup tree with branches and tools"""
     
     # Research branch
@@ -112,48 +127,30 @@ async def setup_tree(tree: OpenAspenTree) -> None:
         system_prompt="You are a helpful research assistant. Provide concise, accurate information.",
     )
     
-    # Try to add hub tools (graceful failure if dependencies missing)
-    try:
-        # Custom leaf using direct DuckDuckGo (works without LangChain wrapper issues)
-        async def web_search(query: str, **kwargs):
-            """Search the web using DuckDuckGo"""
-            try:
-                from duckduckgo_search import DDGS
-                results = list(DDGS().text(query, max_results=5))
-                return {"query": query, "results": results, "count": len(results)}
-            except Exception as e:
-                return {"error": str(e), "query": query}
+    # Custom leaf using direct DuckDuckGo (works without LangChain wrapper issues)
+    async def web_search(query: str, **kwargs):
+        """Search the web using DuckDuckGo"""
+        def search():
+            return list(_get_ddgs().text(query, max_results=5))
         
-        await tree.spawn_leaf(
-            research,
-            "web_search",
-            web_search,
-            "Search the web for information"
-        )
-        logger.info("  ✅ Added web_search leaf")
-    except Exception as e:
-        logger.warning(f"  ⚠️  Could not add web_search: {e}")
+        # The client blocks on HTTP, so keep it off the event loop
+        try:
+            results = await asyncio.to_thread(search)
+        except Exception as e:
+            return {"error": str(e), "query": query}
+        return {"query": query, "results": results, "count": len(results)}
     
-    try:
-        # Wikipedia search
-        async def wiki_search(query: str, **kwargs):
-            """Search Wikipedia"""
-            try:
-                import wikipedia
-                summary = wikipedia.summary(query, sentences=3)
-                return {"query": query, "summary": summary}
-            except Exception as e:
-                return {"error": str(e), "query": query}
+    # Wikipedia search
+    async def wiki_search(query: str, **kwargs):
+        """Search Wikipedia"""
+        def summarize():
+            return _get_wikipedia().summary(query, sentences=3)
         
-        await tree.spawn_leaf(
-            research,
-            "wiki_search",
-            wiki_search,
-            "Search Wikipedia for information"
-        )
-        logger.info("  ✅ Added wiki_search leaf")
-    except Exception as e:
-        logger.warning(f"  ⚠️  Could not add wiki_search: {e}")
+        try:
+            summary = await asyncio.to_thread(summarize)
+        except Exception as e:
+            return {"error": str(e), "query": query}
+        return {"query": query, "summary": summary}
     
     # Utility branch
     utils = tree.add_branch(
@@ -167,19 +164,77 @@ async def setup_tree(tree: OpenAspenTree) -> None:
         """Echo back the input text"""
         return {"input": text, "output": text}
     
-    await tree.spawn_leaf(utils, "echo", echo, "Echo back the input")
-    logger.info("  ✅ Added echo leaf")
+    # Spawn (and index) the leaves concurrently; a failed leaf is logged and the rest kept
+    leaves = [
+        (research, "web_search", web_search, "Search the web for information"),
+        (research, "wiki_search", wiki_search, "Search Wikipedia for information"),
+        (utils, "echo", echo, "Echo back the input"),
+    ]
+    results = await asyncio.gather(
+        *(tree.spawn_leaf(*leaf) for leaf in leaves),
+        return_exceptions=True,
+    )
+    for (_, name, _, _), result in zip(leaves, results):
+        if isinstance(result, Exception):
+            logger.warning(f"  ⚠️  Could not add {name}: {result}")
+        else:
+            logger.info(f"  ✅ Added {name} leaf")
     
     logger.info(f"🌳 Tree setup complete with {len(tree.branches)} branches")
 
 
-def create_app(tree: OpenAspenTree) -> FastAPI:
-    """Create FastAPI application"""
+def create_app(
+    tree: "OpenAspenTree",
+    setup: Optional[Callable[["OpenAspenTree"], Awaitable[None]]] = None,
+) -> "FastAPI":
+    """Create FastAPI application, optionally running setup(tree) on startup"""
+    import orjson
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI, HTTPException
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from pydantic import BaseModel, ConfigDict, Field
+    
+    # FastAPI's own ORJSONResponse is deprecated; this is the same render hook
+    class ORJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    
+    # Ignore the extra fields OpenAI clients send and skip re-validating defaults
+    request_model_config = ConfigDict(extra="ignore", str_strip_whitespace=False, validate_default=False)
+    
+    class ChatMessage(BaseModel):
+        model_config = request_model_config
+        
+        role: Literal["system", "user", "assistant", "tool"]
+        content: str
+    
+    class ChatCompletionRequest(BaseModel):
+        model_config = request_model_config
+        
+        model: str = "openaspen"
+        messages: List[ChatMessage] = Field(min_length=1)
+        temperature: float = 0.7
+        max_tokens: int = 2000
+    
+    class QueryRequest(BaseModel):
+        model_config = request_model_config
+        
+        query: str
+    
+    @asynccontextmanager
+    async def lifespan(app: "FastAPI"):
+        if setup is not None:
+            await setup(tree)
+            app.state.refresh_tree_snapshot()
+        yield
     
     app = FastAPI(
         title="OpenAspen API",
         description="OpenAI-compatible API for OpenAspen tree-structured agents",
         version="0.1.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
     
     app.add_middleware(
@@ -190,15 +245,36 @@ def create_app(tree: OpenAspenTree) -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Providers and branches are fixed once setup_tree has run, so the metadata
+    # endpoints serve a snapshot; call refresh_tree_snapshot() after mutating the tree
+    def refresh_tree_snapshot() -> None:
+        app.state.providers = list(tree.llm_router.get_available_providers())
+        app.state.branch_names = [b.name for b in tree.branches]
+        app.state.branch_info = [
+            {
+                "name": b.name,
+                "description": b.description,
+                "leaves": [l.name for l in b.get_leaves()],
+            }
+            for b in tree.branches
+        ]
+    
+    app.state.refresh_tree_snapshot = refresh_tree_snapshot
+    refresh_tree_snapshot()
+    cache_headers = {"Cache-Control": "max-age=60"}
+    
     @app.get("/")
     async def root():
-        return {
-            "name": "OpenAspen API",
-            "version": "0.1.0",
-            "status": "running",
-            "providers": tree.llm_router.get_available_providers(),
-            "branches": [b.name for b in tree.branches],
-        }
+        return ORJSONResponse(
+            {
+                "name": "OpenAspen API",
+                "version": "0.1.0",
+                "status": "running",
+                "providers": app.state.providers,
+                "branches": app.state.branch_names,
+            },
+            headers=cache_headers,
+        )
     
     @app.get("/health")
     async def health():
@@ -220,24 +296,29 @@ def create_app(tree: OpenAspenTree) -> FastAPI:
     
     @app.post("/v1/chat/completions")
     async def chat_completions(request: ChatCompletionRequest):
+        last_message = request.messages[-1].content
+        if not last_message.strip():
+            raise HTTPException(status_code=400, detail="messages must contain non-empty content")
+        
         try:
-            last_message = request.messages[-1].content if request.messages else ""
             result = await tree.execute(last_message)
             
             response_content = str(result)
             
-            import time
-            return ChatCompletionResponse(
-                created=int(time.time()),
-                model=request.model,
-                choices=[
+            # A plain dict skips model validation on the way out
+            return {
+                "id": "chatcmpl-openaspen",
+                "object": "chat.completion",
+                "created": int(_now()),
+                "model": request.model,
+                "choices": [
                     {
                         "index": 0,
                         "message": {"role": "assistant", "content": response_content},
                         "finish_reason": "stop",
                     }
                 ],
-            )
+            }
         except Exception as e:
             logger.error(f"Chat completion failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -254,18 +335,14 @@ def create_app(tree: OpenAspenTree) -> FastAPI:
     
     @app.get("/tree/info")
     async def tree_info():
-        return {
-            "name": tree.name,
-            "branches": [
-                {
-                    "name": b.name,
-                    "description": b.description,
-                    "leaves": [l.name for l in b.get_leaves()],
-                }
-                for b in tree.branches
-            ],
-            "providers": tree.llm_router.get_available_providers(),
-        }
+        return ORJSONResponse(
+            {
+                "name": tree.name,
+                "branches": app.state.branch_info,
+                "providers": app.state.providers,
+            },
+            headers=cache_headers,
+        )
     
     @app.get("/tree/visualize")
     async def visualize():
@@ -274,6 +351,37 @@ def create_app(tree: OpenAspenTree) -> FastAPI:
     return app
 
 
+def app_factory() -> "FastAPI":
+    """Build the app inside a uvicorn worker (--workers > 1)
+
+    Every worker builds and sets up its own tree, so tools that keep state
+    between requests must move that state to an external store (e.g. Redis)
+    """
+    from openaspen.utils.logging import setup_logging
+    setup_logging(os.getenv("OPENASPEN_LOG", "INFO"))
+    
+    tree = create_tree(
+        use_grok=os.getenv("OPENASPEN_WITH_GROK") == "1",
+        use_openai=os.getenv("OPENASPEN_WITH_OPENAI") == "1",
+    )
+    return create_app(tree, setup=setup_tree)
+
+
+async def probe_http_status(host: str, port: int, path: str, timeout: float = 2.0) -> int:
+    """Return the HTTP status of a single GET, using a bare connection instead of a client session"""
+    async def probe() -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
+    
+    return await asyncio.wait_for(probe(), timeout)
+
+
 async def main():
     parser = argparse.ArgumentParser(description="OpenAspen API Server")
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
@@ -281,74 +389,113 @@ async def main():
     parser.add_argument("--with-grok", action="store_true", help="Enable Grok (requires GROK_API_KEY)")
     parser.add_argument("--with-openai", action="store_true", help="Enable OpenAI (requires OPENAI_API_KEY)")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
     
     args = parser.parse_args()
     
-    print("=" * 60)
-    print("🌲 OpenAspen API Server")
-    print("=" * 60)
-    print()
-    print("Configuration:")
-    print(f"  • LM Studio: ✅ (default, no API key)")
-    print(f"  • Grok: {'✅' if args.with_grok else '❌'}")
-    print(f"  • OpenAI: {'✅' if args.with_openai else '❌'}")
-    print()
+    # One logging setup for the app and uvicorn (log_config=None below)
+    from openaspen.utils.logging import setup_logging
+    setup_logging(os.getenv("OPENASPEN_LOG", "INFO"))
+    
+    # Each banner is a single write, so concurrent output cannot split it
+    print("\n".join([
+        "=" * 60,
+        "🌲 OpenAspen API Server",
+        "=" * 60,
+        "",
+        "Configuration:",
+        f"  • LM Studio: ✅ (default, no API key)",
+        f"  • Grok: {'✅' if args.with_grok else '❌'}",
+        f"  • OpenAI: {'✅' if args.with_openai else '❌'}",
+        "",
+    ]))
     
     # Check LM Studio
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.get("http://localhost:1234/v1/models", timeout=2) as resp:
-                if resp.status == 200:
-                    print("✅ LM Studio server detected!")
-                else:
-                    print("⚠️  LM Studio server not responding properly")
+        status = await probe_http_status("localhost", 1234, "/v1/models")
+        if status == 200:
+            print("✅ LM Studio server detected!")
+        else:
+            print("⚠️  LM Studio server not responding properly")
     except Exception:
-        print("❌ LM Studio server not running!")
-        print("   Start LM Studio and load a model before continuing.")
-        print("   Download from: https://lmstudio.ai/")
-        print()
-    
-    # Create tree
-    print("\n🌲 Building tree...")
-    tree = create_tree(use_grok=args.with_grok, use_openai=args.with_openai)
-    
-    # Setup branches and tools
-    print("📊 Setting up branches and tools...")
-    await setup_tree(tree)
-    
-    # Create app
-    app = create_app(tree)
-    
-    print()
-    print("=" * 60)
-    print("🚀 Server starting...")
-    print("=" * 60)
-    print()
-    print(f"📡 API endpoint: http://{args.host}:{args.port}")
-    print(f"📚 Docs: http://{args.host}:{args.port}/docs")
-    print(f"🌳 Tree info: http://{args.host}:{args.port}/tree/info")
-    print()
-    print("Example requests:")
-    print(f"  curl http://localhost:{args.port}/")
-    print(f"  curl http://localhost:{args.port}/tree/visualize")
-    print(f'  curl -X POST http://localhost:{args.port}/query -H "Content-Type: application/json" -d \'{{"query": "Hello!"}}\'')
-    print()
-    print("Press Ctrl+C to stop")
-    print("=" * 60)
-    print()
+        print("\n".join([
+            "❌ LM Studio server not running!",
+            "   Start LM Studio and load a model before continuing.",
+            "   Download from: https://lmstudio.ai/",
+            "",
+        ]))
+    
+    if args.workers > 1:
+        if args.reload:
+            parser.error("--reload cannot be combined with --workers")
+        # Each worker process builds its own tree through app_factory
+        os.environ["OPENASPEN_WITH_GROK"] = "1" if args.with_grok else "0"
+        os.environ["OPENASPEN_WITH_OPENAI"] = "1" if args.with_openai else "0"
+        print(f"\n🌲 Starting {args.workers} workers, each builds its own tree...")
+    else:
+        # Create tree
+        print("\n🌲 Building tree...")
+        tree = create_tree(use_grok=args.with_grok, use_openai=args.with_openai)
+        
+        # Setup branches and tools
+        print("📊 Setting up branches and tools...")
+        await setup_tree(tree)
+        
+        # Create app
+        app = create_app(tree)
+    
+    print("\n".join([
+        "",
+        "=" * 60,
+        "🚀 Server starting...",
+        "=" * 60,
+        "",
+        f"📡 API endpoint: http://{args.host}:{args.port}",
+        f"📚 Docs: http://{args.host}:{args.port}/docs",
+        f"🌳 Tree info: http://{args.host}:{args.port}/tree/info",
+        "",
+        "Example requests:",
+        f"  curl http://localhost:{args.port}/",
+        f"  curl http://localhost:{args.port}/tree/visualize",
+        f'  curl -X POST http://localhost:{args.port}/query -H "Content-Type: application/json" -d \'{{"query": "Hello!"}}\'',
+        "",
+        "Press Ctrl+C to stop",
+        "=" * 60,
+        "",
+    ]))
     
     # Run server
+    import uvicorn
+    if args.workers > 1:
+        # Blocks in the supervisor process until the workers exit
+        uvicorn.run(
+            "start_server:app_factory",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            loop="uvloop" if uvloop is not None else "auto",
+            log_level="info",
+            log_config=None,
+        )
+        return
+    
     config = uvicorn.Config(
         app,
         host=args.host,
         port=args.port,
         reload=args.reload,
         log_level="info",
+        log_config=None,
     )
     server = uvicorn.Server(config)
     await server.serve()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        # libuv-based loop: lower per-callback overhead for the I/O-bound server
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        asyncio.run(main())
@@ -19,9 +19,10 @@ import os
 from dotenv import load_dotenv
 import logging
 
-from openaspen import OpenAspenTree
-from openaspen.llm.providers import create_llm_config
-from openaspen.integrations.gateway import MessageGateway
+try:
+    import uvloop
+except ImportError:  # Optional speedup; the default asyncio loop works too
+    uvloop = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,8 +34,34 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+# Search clients are created on first use and shared, so repeated searches reuse
+# one HTTP session instead of opening a new connection pool per call
+_ddgs = None
+_wikipedia = None
+
+
+def _get_ddgs():
+    global _ddgs
+    if _ddgs is None:
+        from duckduckgo_search import DDGS
+        _ddgs = DDGS()
+    return _ddgs
+
+
+def _get_wikipedia():
+    global _wikipedia
+    if _wikipedia is None:
+        import wikipedia
+        wikipedia.set_lang("en")
+        _wikipedia = wikipedia
+    return _wikipedia
+
+
 async def create_tree():
     """Create OpenAspen tree with LM Studio"""
+    # Imported here so a missing token or dependency exits without loading the framework
+    from openaspen import OpenAspenTree
+    from openaspen.llm.providers import create_llm_config
     
     llm_configs = {
         "lmstudio": create_llm_config(
@@ -84,9 +111,12 @@ async def create_tree():
     # Web search tool
     async def web_search(query: str, **kwargs):
         """Search the web using DuckDuckGo"""
+        def search():
+            return list(_get_ddgs().text(query, max_results=3))
+        
         try:
-            from duckduckgo_search import DDGS
-            results = list(DDGS().text(query, max_results=3))
+            # The client blocks on HTTP, so keep it off the event loop
+            results = await asyncio.to_thread(search)
             if results:
                 summary = "\n\n".join([
                     f"**{r.get('title', 'Result')}**\n{r.get('body', '')[:200]}..."
@@ -97,22 +127,18 @@ async def create_tree():
         except Exception as e:
             return f"❌ Search error: {str(e)}"
     
-    await tree.spawn_leaf(research, "web_search", web_search, "Search the web for information")
-    logger.info("  ✅ Added web_search")
-    
     # Wikipedia tool
     async def wiki_search(query: str, **kwargs):
         """Search Wikipedia"""
+        def summarize():
+            return _get_wikipedia().summary(query, sentences=3)
+        
         try:
-            import wikipedia
-            summary = wikipedia.summary(query, sentences=3)
+            summary = await asyncio.to_thread(summarize)
             return f"📚 Wikipedia: {query}\n\n{summary}"
         except Exception as e:
             return f"❌ Wikipedia error: {str(e)}"
     
-    await tree.spawn_leaf(research, "wiki_search", wiki_search, "Search Wikipedia")
-    logger.info("  ✅ Added wiki_search")
-    
     # Utility branch
     utils = tree.add_branch(
         "utils",
@@ -124,33 +150,110 @@ async def create_tree():
         """Echo back the input"""
         return f"🔊 Echo: {text}"
     
-    await tree.spawn_leaf(utils, "echo", echo, "Echo back text")
-    logger.info("  ✅ Added echo")
+    # Spawn (and index) the leaves concurrently; a failed leaf is logged and the rest kept
+    leaves = [
+        (research, "web_search", web_search, "Search the web for information"),
+        (research, "wiki_search", wiki_search, "Search Wikipedia"),
+        (utils, "echo", echo, "Echo back text"),
+    ]
+    results = await asyncio.gather(
+        *(tree.spawn_leaf(*leaf) for leaf in leaves),
+        return_exceptions=True,
+    )
+    for (_, name, _, _), result in zip(leaves, results):
+        if isinstance(result, Exception):
+            logger.warning(f"  ⚠️  Could not add {name}: {result}")
+        else:
+            logger.info(f"  ✅ Added {name}")
     
     logger.info(f"🌳 Tree setup complete with {len(tree.branches)} branches")
     
     return tree
 
 
+async def run_bot(telegram_token: str):
+    """Build the tree and poll Telegram on one event loop until cancelled"""
+    print("🌲 Building OpenAspen tree...")
+    tree = await create_tree()
+    
+    print("\n".join([
+        "",
+        "🤖 Starting Telegram bot...",
+    ]))
+    
+    # Create message gateway
+    from openaspen.integrations.gateway import MessageGateway
+    gateway = MessageGateway(tree_executor=tree)
+    
+    # Register Telegram bot
+    telegram_bot = gateway.register_telegram(telegram_token)
+    
+    # Initialize bot
+    await telegram_bot.initialize()
+    application = telegram_bot.application
+    
+    # Polling runs on this loop instead of run_polling() creating a new one, so the
+    # tree, the gateway and the bot's background tasks all share a single loop
+    async with application:
+        await application.start()
+        await application.updater.start_polling(drop_pending_updates=True)
+        
+        print("\n".join([
+            "",
+            "=" * 60,
+            "✅ Telegram Bot Running!",
+            "=" * 60,
+            "",
+            "📱 Your bot is ready to receive messages",
+            "🌲 Tree structure:",
+            tree.visualize(),
+            "",
+            "💬 Available commands:",
+            "  /start  - Welcome message",
+            "  /help   - Show help",
+            "  /tree   - View agent structure",
+            "  /status - Check system status",
+            "",
+            "Or just send any message naturally!",
+            "",
+            "Press Ctrl+C to stop",
+            "=" * 60,
+            "",
+        ]))
+        
+        try:
+            # Ctrl+C cancels this wait; shut down in reverse order
+            await asyncio.Event().wait()
+        finally:
+            await application.updater.stop()
+            await application.stop()
+            await gateway.close()
+
+
 def main():
-    """Main entry point - runs synchronously"""
+    """Main entry point"""
     
-    print("=" * 60)
-    print("🤖 OpenAspen Telegram Bot")
-    print("=" * 60)
-    print()
+    # Each banner is a single write, so concurrent output cannot split it
+    print("\n".join([
+        "=" * 60,
+        "🤖 OpenAspen Telegram Bot",
+        "=" * 60,
+        "",
+    ]))
     
     # Check for Telegram token
     telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
     if not telegram_token:
-        print("❌ TELEGRAM_BOT_TOKEN not found in .env")
-        print()
-        print("Setup instructions:")
-        print("1. Talk to @BotFather on Telegram")
-        print("2. Create a new bot with /newbot")
-        print("3. Copy the token")
-        print("4. Add to .env: TELEGRAM_BOT_TOKEN=your-token-here")
-        print()
+        print("\n".join([
+            "❌ TELEGRAM_BOT_TOKEN not found in .env",
+            "",
+            "Setup instructions:",
+            "1. Talk to @BotFather on Telegram",
+            "2. Create a new bot with /newbot",
+            "3. Copy the token",
+            "4. Add to .env: TELEGRAM_BOT_TOKEN=your-token-here",
+            "",
+        ]))
         return
     
     print("✅ Telegram token found")
@@ -160,54 +263,24 @@ def main():
         import telegram
         print("✅ python-telegram-bot installed")
     except ImportError:
-        print("❌ python-telegram-bot not installed")
-        print()
-        print("Install it with:")
-        print("  pip install python-telegram-bot")
-        print()
+        print("\n".join([
+            "❌ python-telegram-bot not installed",
+            "",
+            "Install it with:",
+            "  pip install python-telegram-bot",
+            "",
+        ]))
         return
     
     print()
-    print("🌲 Building OpenAspen tree...")
-    
-    # Create tree synchronously
-    tree = asyncio.run(create_tree())
-    
-    print()
-    print("🤖 Starting Telegram bot...")
-    
-    # Create message gateway
-    gateway = MessageGateway(tree_executor=tree)
-    
-    # Register Telegram bot
-    telegram_bot = gateway.register_telegram(telegram_token)
-    
-    # Initialize bot
-    asyncio.run(telegram_bot.initialize())
-    
-    print()
-    print("=" * 60)
-    print("✅ Telegram Bot Running!")
-    print("=" * 60)
-    print()
-    print("📱 Your bot is ready to receive messages")
-    print("🌲 Tree structure:")
-    print(tree.visualize())
-    print()
-    print("💬 Available commands:")
-    print("  /start  - Welcome message")
-    print("  /help   - Show help")
-    print("  /tree   - View agent structure")
-    print("  /status - Check system status")
-    print()
-    print("Or just send any message naturally!")
-    print()
-    print("Press Ctrl+C to stop")
-    print("=" * 60)
-    print()
     
-    # Start polling - this creates its own event loop
-    telegram_bot.application.run_polling(drop_pending_updates=True)
+    # libuv-based loop when available: lower per-callback overhead
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(run_bot(telegram_token))
+    except KeyboardInterrupt:
+        print("\n👋 Telegram bot stopped")
 
 
 if __name__ == "__main__":
@@ -36,24 +36,29 @@ async def test_lmstudio_direct():
     print("📊 Testing Queries:")
     print("=" * 60)
     
-    for i, query in enumerate(queries, 1):
+    async def ask(query):
+        try:
+            response = await llm.ainvoke([HumanMessage(content=query)])
+            return query, response.content, None
+        except Exception as e:
+            return query, None, e
+    
+    # The queries are independent, so send them together and report in order
+    results = await asyncio.gather(*(ask(query) for query in queries))
+    
+    for i, (query, content, error) in enumerate(results, 1):
         print(f"\n{i}. Query: {query}")
         print("-" * 60)
         
-        try:
-            # Make the LLM call
-            messages = [HumanMessage(content=query)]
-            response = await llm.ainvoke(messages)
-            
-            print(f"✅ Response: {response.content}")
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        if error is not None:
+            print(f"❌ Error: {error}")
             print("\n💡 Troubleshooting:")
             print("  - Make sure LM Studio is running")
             print("  - Check that Local Server is started")
             print("  - Verify a model is loaded")
             return False
+        
+        print(f"✅ Response: {content}")
     
     print("\n" + "=" * 60)
     print("\n🎉 Success! LM Studio is working with OpenAspen!")
@@ -1,132 +0,0 @@
-#!/usr/bin/env python3
-"""
-Quick test script to verify OpenAspen setup
-Tests LangChain Hub integration without pydantic_v1 issues
-"""
-
-import asyncio
-
-
-async def test_imports():
-    """Test that all imports work"""
-    print("🧪 Testing OpenAspen Setup\n")
-    print("=" * 60)
-    
-    # Test 1: Core imports
-    print("1. Testing core imports...")
-    try:
-        from openaspen.integrations.langchain_hub import LangChainHubLoader
-        print("   ✅ LangChainHubLoader imported")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Test 2: List tools
-    print("\n2. Listing available tools...")
-    try:
-        tools = LangChainHubLoader.list_available_tools()
-        print(f"   ✅ Found {len(tools)} tools")
-        for tool in tools[:5]:  # Show first 5
-            info = LangChainHubLoader.get_tool_info(tool)
-            api_key = f" (needs {info['requires_api_key']})" if info['requires_api_key'] else " ✅"
-            print(f"      • {tool}{api_key}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Test 3: Direct DuckDuckGo usage (bypass LangChain wrapper)
-    print("\n3. Testing DuckDuckGo search directly...")
-    try:
-        from duckduckgo_search import DDGS
-        
-        results = DDGS().text("Python programming language", max_results=2)
-        print(f"   ✅ DuckDuckGo search works!")
-        print(f"      Found {len(list(results))} results")
-    except Exception as e:
-        print(f"   ⚠️  DuckDuckGo test skipped: {e}")
-    
-    # Test 4: Wikipedia direct usage
-    print("\n4. Testing Wikipedia directly...")
-    try:
-        import wikipedia
-        
-        summary = wikipedia.summary("Python (programming language)", sentences=2)
-        print(f"   ✅ Wikipedia works!")
-        print(f"      Preview: {summary[:100]}...")
-    except Exception as e:
-        print(f"   ⚠️  Wikipedia test skipped: {e}")
-    
-    print("\n" + "=" * 60)
-    print("✅ Setup test complete!\n")
-    
-    return True
-
-
-async def test_custom_leaf():
-    """Test creating a custom leaf without LangChain wrapper"""
-    print("=" * 60)
-    print("5. Testing custom leaf creation...")
-    
-    try:
-        from openaspen.core.leaf import Leaf
-        
-        # Create a simple custom function
-        async def my_search(query: str, **kwargs):
-            """Custom search function using DuckDuckGo directly"""
-            from duckduckgo_search import DDGS
-            results = list(DDGS().text(query, max_results=3))
-            return {"query": query, "count": len(results), "results": results}
-        
-        # Create a leaf
-        leaf = Leaf(
-            name="custom_search",
-            tool_func=my_search,
-            description="Custom DuckDuckGo search without LangChain wrapper"
-        )
-        
-        print(f"   ✅ Created leaf: {leaf.name}")
-        print(f"      Description: {leaf.description}")
-        
-        # Test execution
-        print("\n   Testing leaf execution...")
-        result = await leaf.execute("OpenAspen AI framework")
-        
-        if result["success"]:
-            print(f"   ✅ Leaf executed successfully!")
-            print(f"      Found {result['result']['count']} results")
-        else:
-            print(f"   ❌ Execution failed: {result.get('error')}")
-        
-    except Exception as e:
-        print(f"   ⚠️  Custom leaf test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    print("=" * 60)
-
-
-async def main():
-    """Run all tests"""
-    print("\n🌲 OpenAspen Setup Verification")
-    print("Testing without LM Studio or API keys\n")
-    
-    success = await test_imports()
-    
-    if success:
-        await test_custom_leaf()
-    
-    print("\n📋 Summary:")
-    print("   • Core imports: ✅ Working")
-    print("   • LangChain Hub tools: ✅ Listed")
-    print("   • DuckDuckGo: ✅ Direct usage works")
-    print("   • Wikipedia: ✅ Direct usage works")
-    print("   • Custom leaves: ✅ Can create without LangChain wrappers")
-    print("\n💡 Next steps:")
-    print("   1. Install LM Studio: https://lmstudio.ai/")
-    print("   2. Start LM Studio server")
-    print("   3. Run: python examples/lmstudio_quickstart.py")
-    print("\n   Or use custom leaves with direct tool integration!")
-
-
-if __name__ == "__main__":
-    asyncio.run(main())
@@ -0,0 +1,13 @@
+import pytest
+from openaspen import OpenAspenTree
+from openaspen.llm.providers import LLMConfig, create_llm_config
+
+
+@pytest.fixture(scope="session")
+def openai_config() -> LLMConfig:
+    return create_llm_config(provider="openai", api_key="test")
+
+
+@pytest.fixture
+def fresh_tree(openai_config: LLMConfig) -> OpenAspenTree:
+    return OpenAspenTree(llm_configs={"openai": openai_config})
@@ -49,6 +49,21 @@ class TestTreeNode:
         assert child.get_depth() == 1
         assert grandchild.get_depth() == 2
 
+    def test_get_depth_after_reparent(self) -> None:
+        root = Branch(name="root")
+        child = Branch(name="child")
+        grandchild = Branch(name="grandchild")
+
+        child.add_child(grandchild)
+        assert grandchild.get_depth() == 1
+
+        root.add_child(child)
+        assert grandchild.get_depth() == 2
+
+        root.remove_child(child)
+        assert child.get_depth() == 0
+        assert grandchild.get_depth() == 1
+
     def test_find_child(self) -> None:
         parent = Branch(name="parent")
         child1 = Branch(name="child1")
@@ -73,8 +88,18 @@ class TestTreeNode:
 
         siblings = child2.get_siblings()
         assert len(siblings) == 2
-        assert child1 in siblings
-        assert child3 in siblings
+        assert set(siblings) == {child1, child3}
+
+    def test_remove_child_uses_identity(self) -> None:
+        parent = Branch(name="parent")
+        first = Branch(name="twin", id="same")
+        second = Branch(name="twin", id="same")
+        parent.add_child(first)
+        parent.add_child(second)
+
+        assert first != second
+        parent.remove_child(second)
+        assert parent.children == [first]
 
 
 class TestLeaf:
@@ -136,8 +161,7 @@ class TestBranch:
 
         leaves = branch.get_leaves()
         assert len(leaves) == 2
-        assert leaf1 in leaves
-        assert leaf2 in leaves
+        assert set(leaves) == {leaf1, leaf2}
 
     def test_get_branches(self) -> None:
         parent = Branch(name="parent")
@@ -147,4 +171,4 @@ class TestBranch:
 
         branches = parent.get_branches()
         assert len(branches) == 1
-        assert child_branch in branches
+        assert branches[0] is child_branch
@@ -1,11 +1,36 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
-from openaspen.integrations.langchain_hub import LangChainHubLoader, load_hub_tools
+from openaspen.integrations.langchain_hub import (
+    LangChainHubLoader,
+    ToolSpec,
+    _resolve_tool_class,
+    load_hub_tools,
+    load_hub_tools_async,
+)
 from openaspen.core.branch import Branch
 from openaspen.core.leaf import Leaf
 
 
 class TestLangChainHubLoader:
+    @pytest.fixture(autouse=True)
+    def clear_tool_class_cache(self):
+        # load_tool memoizes resolved classes; clear them so patched imports are seen
+        _resolve_tool_class.cache_clear()
+        yield
+        _resolve_tool_class.cache_clear()
+
+    @pytest.fixture
+    def patched_hub(self, request):
+        # Parametrized indirectly with the class name the tool's module should expose
+        with patch("openaspen.integrations.langchain_hub.importlib.import_module") as mock_import:
+            mock_tool_class = Mock()
+            mock_tool_instance = Mock()
+            mock_tool_class.return_value = mock_tool_instance
+            mock_module = Mock()
+            setattr(mock_module, request.param, mock_tool_class)
+            mock_import.return_value = mock_module
+            yield mock_import, mock_tool_instance, mock_tool_class
+
     def test_list_available_tools(self):
         tools = LangChainHubLoader.list_available_tools()
         assert isinstance(tools, list)
@@ -26,15 +51,9 @@ class TestLangChainHubLoader:
         info = LangChainHubLoader.get_tool_info("nonexistent_tool")
         assert info is None
 
-    @patch("openaspen.integrations.langchain_hub.importlib.import_module")
-    def test_load_tool_success(self, mock_import):
-        mock_tool_class = Mock()
-        mock_tool_instance = Mock()
-        mock_tool_class.return_value = mock_tool_instance
-
-        mock_module = Mock()
-        mock_module.DuckDuckGoSearchRun = mock_tool_class
-        mock_import.return_value = mock_module
+    @pytest.mark.parametrize("patched_hub", ["DuckDuckGoSearchRun"], indirect=True)
+    def test_load_tool_success(self, patched_hub):
+        mock_import, mock_tool_instance, mock_tool_class = patched_hub
 
         tool = LangChainHubLoader.load_tool("duckduckgo_search")
 
@@ -46,15 +65,9 @@ class TestLangChainHubLoader:
         with pytest.raises(ValueError, match="Tool 'invalid_tool' not found"):
             LangChainHubLoader.load_tool("invalid_tool")
 
-    @patch("openaspen.integrations.langchain_hub.importlib.import_module")
-    def test_load_tool_with_custom_params(self, mock_import):
-        mock_tool_class = Mock()
-        mock_tool_instance = Mock()
-        mock_tool_class.return_value = mock_tool_instance
-
-        mock_module = Mock()
-        mock_module.TavilySearchResults = mock_tool_class
-        mock_import.return_value = mock_module
+    @pytest.mark.parametrize("patched_hub", ["TavilySearchResults"], indirect=True)
+    def test_load_tool_with_custom_params(self, patched_hub):
+        _, mock_tool_instance, mock_tool_class = patched_hub
 
         custom_params = {"max_results": 10}
         tool = LangChainHubLoader.load_tool("tavily_search", custom_params)
@@ -140,25 +153,35 @@ class TestLangChainHubLoader:
         assert tools[0] == mock_tool
         mock_load_tool.assert_called_once_with("duckduckgo_search")
 
+    @pytest.mark.asyncio
     @patch("openaspen.integrations.langchain_hub.LangChainHubLoader.load_tool")
-    def test_load_hub_tools_multiple(self, mock_load_tool):
+    async def test_load_hub_tools_multiple(self, mock_load_tool):
         mock_tool1 = Mock()
         mock_tool2 = Mock()
-        mock_load_tool.side_effect = [mock_tool1, mock_tool2]
+        # Loads run concurrently, so answer by name rather than by call order
+        loaded = {"duckduckgo_search": mock_tool1, "wikipedia": mock_tool2}
+        mock_load_tool.side_effect = loaded.__getitem__
 
-        tools = load_hub_tools(["duckduckgo_search", "wikipedia"])
+        tools = await load_hub_tools_async(["duckduckgo_search", "wikipedia"])
 
         assert len(tools) == 2
         assert tools[0] == mock_tool1
         assert tools[1] == mock_tool2
         assert mock_load_tool.call_count == 2
 
+    @pytest.mark.asyncio
     @patch("openaspen.integrations.langchain_hub.LangChainHubLoader.load_tool")
-    def test_load_hub_tools_with_failures(self, mock_load_tool):
+    async def test_load_hub_tools_with_failures(self, mock_load_tool):
         mock_tool = Mock()
-        mock_load_tool.side_effect = [mock_tool, ValueError("Tool not found")]
 
-        tools = load_hub_tools(["duckduckgo_search", "invalid_tool"])
+        def load(tool_name):
+            if tool_name == "invalid_tool":
+                raise ValueError("Tool not found")
+            return mock_tool
+
+        mock_load_tool.side_effect = load
+
+        tools = await load_hub_tools_async(["duckduckgo_search", "invalid_tool"])
 
         assert len(tools) == 1
         assert tools[0] == mock_tool
@@ -216,13 +239,12 @@ class TestLangChainHubLoader:
 
 class TestToolMetadata:
     def test_all_tools_have_required_fields(self):
-        required_fields = ["import_path", "class_name", "description", "default_params", "requires_api_key"]
-
-        for tool_name, tool_info in LangChainHubLoader.AVAILABLE_TOOLS.items():
-            for field in required_fields:
-                assert field in tool_info, f"Tool '{tool_name}' missing field '{field}'"
+        for tool_name, spec in LangChainHubLoader.AVAILABLE_TOOLS.items():
+            assert isinstance(spec, ToolSpec), f"Tool '{tool_name}' is not a ToolSpec"
+            assert spec.import_path, f"Tool '{tool_name}' missing import_path"
+            assert spec.class_name, f"Tool '{tool_name}' missing class_name"
 
     def test_tool_descriptions_not_empty(self):
-        for tool_name, tool_info in LangChainHubLoader.AVAILABLE_TOOLS.items():
-            assert tool_info["description"], f"Tool '{tool_name}' has empty description"
-            assert len(tool_info["description"]) > 10, f"Tool '{tool_name}' description too short"
+        for tool_name, spec in LangChainHubLoader.AVAILABLE_TOOLS.items():
+            assert spec.description, f"Tool '{tool_name}' has empty description"
+            assert len(spec.description) > 10, f"Tool '{tool_name}' description too short"
@@ -74,6 +74,19 @@ class TestLLMRouter:
         coding_provider = router.route_by_skill("coding")
         assert coding_provider in ["openai", "anthropic"]
 
+    def test_route_by_skill_follows_provider_changes(self) -> None:
+        configs = {
+            "openai": create_llm_config(provider="openai", api_key="test"),
+        }
+        router = LLMRouter(configs)
+        assert router.route_by_skill("local") == "openai"
+
+        router.add_provider("ollama", create_llm_config(provider="ollama"))
+        assert router.route_by_skill("local") == "ollama"
+
+        router.remove_provider("ollama")
+        assert router.route_by_skill("local") == "openai"
+
     def test_add_provider(self) -> None:
         configs = {
             "openai": create_llm_config(provider="openai"),
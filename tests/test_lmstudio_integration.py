@@ -0,0 +1,55 @@
+import socket
+import pytest
+from openaspen import OpenAspenTree
+from openaspen.llm.providers import create_llm_config
+
+LMSTUDIO_HOST = "localhost"
+LMSTUDIO_PORT = 1234
+
+
+def _lmstudio_reachable() -> bool:
+    try:
+        with socket.create_connection((LMSTUDIO_HOST, LMSTUDIO_PORT), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+async def simple_test(query: str) -> str:
+    return f"Processed: {query}"
+
+
+@pytest.fixture
+async def lmstudio_tree() -> OpenAspenTree:
+    configs = {
+        "lmstudio": create_llm_config(
+            provider="lmstudio",
+            api_base=f"http://{LMSTUDIO_HOST}:{LMSTUDIO_PORT}/v1",
+        )
+    }
+    tree = OpenAspenTree(llm_configs=configs, name="TestTree")
+    agent = tree.grow_branch(
+        "test_agent",
+        description="A simple test agent",
+        llm_provider="lmstudio",
+    )
+    await tree.spawn_leaf(agent, "test_skill", simple_test, "Test skill")
+    await tree.index_tree()
+    return tree
+
+
+class TestLMStudioIntegration:
+    @pytest.mark.asyncio
+    async def test_tree_initialization(self, lmstudio_tree: OpenAspenTree) -> None:
+        assert lmstudio_tree.llm_router.get_available_providers()
+        agent = lmstudio_tree.get_branch("test_agent")
+        assert agent is not None
+        assert [leaf.name for leaf in agent.get_leaves()] == ["test_skill"]
+        assert lmstudio_tree.shared_rag_db.get_stats()["total_documents"] >= 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @pytest.mark.skipif(not _lmstudio_reachable(), reason="LM Studio not running")
+    async def test_execute(self, lmstudio_tree: OpenAspenTree) -> None:
+        result = await lmstudio_tree.execute("Test this query")
+        assert "success" in result
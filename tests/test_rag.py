@@ -1,5 +1,10 @@
+import faiss
+import numpy as np
 import pytest
+from openaspen.rag.cache import SemanticResponseCache
 from openaspen.rag.embeddings import EmbeddingManager
+from openaspen.rag import store as store_module
+from openaspen.rag.store import GroupRAGStore
 from openaspen.core.leaf import Leaf
 from openaspen.core.branch import Branch
 
@@ -19,6 +24,14 @@ class TestEmbeddingManager:
         embeddings = manager.get_embeddings()
         assert embeddings is not None
 
+    def test_embeddings_client_shared(self) -> None:
+        first = EmbeddingManager(provider="openai", api_key="test")
+        second = EmbeddingManager(provider="openai", api_key="test")
+        other_key = EmbeddingManager(provider="openai", api_key="other")
+
+        assert first.get_embeddings() is second.get_embeddings()
+        assert first.get_embeddings() is not other_key.get_embeddings()
+
 
 class TestLeafEmbedding:
     def test_leaf_embedding_text(self) -> None:
@@ -45,3 +58,237 @@ class TestLeafEmbedding:
         embedding_text = leaf.get_embedding_text()
         assert "param_leaf" in embedding_text
         assert "Parameters:" in embedding_text
+
+
+class TestEmbedDocuments:
+    @pytest.mark.asyncio
+    async def test_embed_documents_batches(self) -> None:
+        manager = EmbeddingManager(provider="fake")
+        texts = [f"doc {i}" for i in range(10)]
+
+        vectors = await manager.embed_documents(texts, batch_size=3, max_concurrency=2)
+
+        assert vectors.shape == (10, 384)
+        assert vectors.dtype == np.float32
+
+    @pytest.mark.asyncio
+    async def test_embed_query_returns_float32(self) -> None:
+        manager = EmbeddingManager(provider="fake")
+
+        vector = await manager.embed_query("query")
+
+        assert vector.shape == (384,)
+        assert vector.dtype == np.float32
+
+    @pytest.mark.asyncio
+    async def test_embed_query_is_cached(self) -> None:
+        manager = EmbeddingManager(provider="fake", query_cache_size=1)
+
+        first = await manager.embed_query("query")
+        again = await manager.embed_query("query")
+        await manager.embed_query("other")
+        evicted = await manager.embed_query("query")
+
+        assert again is first
+        assert evicted is not first
+
+    @pytest.mark.asyncio
+    async def test_embed_documents_uses_persistent_cache(self, tmp_path) -> None:
+        cache_path = str(tmp_path / "embeddings.db")
+        manager = EmbeddingManager(provider="fake", cache_path=cache_path)
+        first = await manager.embed_documents(["alpha", "beta", "alpha"])
+
+        reloaded = EmbeddingManager(provider="fake", cache_path=cache_path)
+        second = await reloaded.embed_documents(["beta", "alpha"])
+
+        assert np.array_equal(first[0], first[2])
+        assert np.array_equal(second, first[[1, 0]])
+
+
+class TestGroupRAGStore:
+    @pytest.mark.asyncio
+    async def test_index_branch_batches_nested_leaves(self) -> None:
+        store = GroupRAGStore(embedding_manager=EmbeddingManager(provider="fake"))
+        branch = Branch(name="root")
+        branch.add_leaf("leaf_a", dummy_tool, "First leaf")
+        sub_branch = Branch(name="sub")
+        sub_branch.add_leaf("leaf_b", dummy_tool, "Second leaf")
+        branch.add_child(sub_branch)
+
+        await store.index_branch(branch)
+
+        results = await store.similarity_search("leaf", k=5)
+        assert {doc.metadata["leaf_name"] for doc in results} == {"leaf_a", "leaf_b"}
+        assert {doc.metadata["branch"] for doc in results} == {"root", "sub"}
+        assert {doc.metadata["path"] for doc in results} == {"root/leaf_a", "root/sub/leaf_b"}
+
+    @pytest.mark.asyncio
+    async def test_index_branches_embeds_once(self) -> None:
+        manager = EmbeddingManager(provider="fake")
+        store = GroupRAGStore(embedding_manager=manager)
+        branches = []
+        for name in ("alpha", "beta"):
+            branch = Branch(name=name)
+            branch.add_leaf(f"{name}_leaf", dummy_tool, f"Leaf on {name}")
+            branches.append(branch)
+
+        calls = []
+        embed_documents = manager.embed_documents
+
+        async def counting_embed(texts, *args, **kwargs):
+            calls.append(len(texts))
+            return await embed_documents(texts, *args, **kwargs)
+
+        manager.embed_documents = counting_embed
+        await store.index_branches(branches)
+
+        assert calls == [2]
+        assert store.get_stats()["total_documents"] == 2
+
+    @pytest.mark.asyncio
+    async def test_similarity_search_batch(self) -> None:
+        store = GroupRAGStore(embedding_manager=EmbeddingManager(provider="fake"))
+        branch = Branch(name="root")
+        for i in range(4):
+            branch.add_leaf(f"leaf_{i}", dummy_tool, f"Leaf number {i}")
+        await store.index_branch(branch)
+
+        results = await store.similarity_search_batch(["first", "second", "third"], k=2)
+
+        assert len(results) == 3
+        assert all(len(hits) == 2 for hits in results)
+        assert all(isinstance(score, float) for hits in results for _, score in hits)
+
+    @pytest.fixture
+    def cpu_replicas(self, monkeypatch):
+        # Stand in for index_cpu_to_all_gpus on a two-GPU host: an IndexReplicas over CPU
+        # copies has the same restriction of rejecting per-search parameters
+        def clone(index, co=None):
+            replicas = faiss.IndexReplicas()
+            copies = [faiss.clone_index(index) for _ in range(2)]
+            for copy in copies:
+                replicas.addIndex(copy)
+            replicas.referenced_objects = copies
+            return replicas
+
+        monkeypatch.setattr(faiss, "StandardGpuResources", object, raising=False)
+        monkeypatch.setattr(faiss, "GpuMultipleClonerOptions", lambda: type("Options", (), {})(), raising=False)
+        monkeypatch.setattr(faiss, "get_num_gpus", lambda: 2)
+        monkeypatch.setattr(faiss, "index_cpu_to_all_gpus", clone, raising=False)
+
+    async def _indexed_store(self, leaves_per_branch: int, **kwargs) -> GroupRAGStore:
+        store = GroupRAGStore(embedding_manager=EmbeddingManager(provider="fake"), **kwargs)
+        branches = []
+        for name in ("alpha", "beta"):
+            branch = Branch(name=name)
+            for i in range(leaves_per_branch):
+                branch.add_leaf(f"{name}_{i}", dummy_tool, f"Leaf {i} on {name}")
+            branches.append(branch)
+        await store.index_branches(branches)
+        return store
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ivf", [False, True])
+    async def test_gpu_replica_searches(self, cpu_replicas, monkeypatch, ivf: bool) -> None:
+        monkeypatch.setattr(store_module, "IVF_THRESHOLD", 64 if ivf else 10_000)
+        store = await self._indexed_store(50, use_gpu=True)
+        assert isinstance(store._gpu_index, faiss.IndexReplicas)
+        assert isinstance(store._index, faiss.IndexIVF) is ivf
+
+        assert len(await store.similarity_search_with_score("leaf", k=3)) == 3
+
+        filtered = await store.similarity_search_with_score("leaf", k=3, filter={"branch": "alpha"})
+        assert len(filtered) == 3
+        assert all(doc.metadata["branch"] == "alpha" for doc, _ in filtered)
+
+        siblings = await store.get_sibling_context("alpha", "leaf", k=3)
+        assert len(siblings) == 3
+        assert all(doc.metadata["branch"] == "beta" for doc in siblings)
+
+    @pytest.mark.asyncio
+    async def test_gpu_clone_failure_falls_back_to_cpu(self, cpu_replicas, monkeypatch) -> None:
+        def fail(index, co=None):
+            raise RuntimeError("no GPU implementation")
+
+        monkeypatch.setattr(faiss, "index_cpu_to_all_gpus", fail, raising=False)
+        store = await self._indexed_store(3, use_gpu=True, vector_dtype="float16")
+
+        assert store._gpu_index is None
+        assert store.use_gpu is False
+        assert len(store._documents) == store._index.ntotal == 6
+        assert len(await store.similarity_search_with_score("leaf", k=2)) == 2
+
+    @pytest.mark.asyncio
+    async def test_embedding_store_fp16_roundtrip(self, tmp_path) -> None:
+        # The on-disk embedding cache gives both stores identical leaf vectors
+        manager = EmbeddingManager(provider="fake", cache_path=str(tmp_path / "embeddings.db"))
+        stores = {
+            dtype: GroupRAGStore(embedding_manager=manager, vector_dtype=dtype)
+            for dtype in ("float32", "float16", "int8")
+        }
+        branch = Branch(name="root")
+        for i in range(20):
+            branch.add_leaf(f"leaf_{i}", dummy_tool, f"Leaf number {i}")
+        for store in stores.values():
+            await store.index_branch(branch)
+
+        queries = ["first", "second", "third"]
+        exact = await stores["float32"].similarity_search_batch(queries, k=20)
+        for dtype in ("float16", "int8"):
+            approx = await stores[dtype].similarity_search_batch(queries, k=5)
+            for exact_hits, approx_hits in zip(exact, approx):
+                exact_scores = {doc.metadata["leaf_name"]: score for doc, score in exact_hits}
+                # Near-ties may swap places, so compare scores rather than exact ranks
+                assert np.allclose(
+                    [score for _, score in approx_hits], [score for _, score in exact_hits[:5]], atol=0.02
+                )
+                top_leaf = approx_hits[0][0].metadata["leaf_name"]
+                assert exact_scores[top_leaf] >= exact_hits[0][1] - 0.02
+
+    def test_unsupported_vector_dtype(self) -> None:
+        with pytest.raises(ValueError, match="vector_dtype"):
+            GroupRAGStore(embedding_manager=EmbeddingManager(provider="fake"), vector_dtype="int4")
+
+    @pytest.mark.asyncio
+    async def test_persist_and_load_faiss_index(self, tmp_path) -> None:
+        manager = EmbeddingManager(provider="fake")
+        store = GroupRAGStore(persist_directory=str(tmp_path), embedding_manager=manager)
+        branch = Branch(name="root")
+        for i in range(3):
+            branch.add_leaf(f"leaf_{i}", dummy_tool, f"Leaf number {i}")
+        await store.index_branch(branch)
+        store.persist()
+
+        loaded = GroupRAGStore(
+            persist_directory=str(tmp_path), embedding_manager=manager, load_persisted=True
+        )
+
+        assert loaded.get_stats()["total_documents"] == 3
+        results = await loaded.similarity_search("leaf", k=3, filter={"branch": "root"})
+        assert {doc.metadata["leaf_name"] for doc in results} == {"leaf_0", "leaf_1", "leaf_2"}
+
+
+class TestSemanticResponseCache:
+    @pytest.mark.asyncio
+    async def test_hit_and_miss(self) -> None:
+        cache = SemanticResponseCache(EmbeddingManager(provider="fake"))
+        assert await cache.get("check disk space") is None
+
+        await cache.set("check disk space", "42% used")
+
+        assert await cache.get("check disk space") == "42% used"
+        assert await cache.get("tell me a joke") is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self) -> None:
+        cache = SemanticResponseCache(EmbeddingManager(provider="fake"), max_entries=2)
+        await cache.set("first", "1")
+        await cache.set("second", "2")
+        assert await cache.get("first") == "1"
+
+        await cache.set("third", "3")
+
+        assert len(cache) == 2
+        assert await cache.get("second") is None
+        assert await cache.get("first") == "1"
+        assert await cache.get("third") == "3"
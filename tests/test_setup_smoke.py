@@ -0,0 +1,74 @@
+import importlib.util
+import pytest
+from openaspen.core.leaf import Leaf
+from openaspen.integrations.langchain_hub import LangChainHubLoader
+
+requires_ddgs = pytest.mark.skipif(
+    importlib.util.find_spec("duckduckgo_search") is None,
+    reason="duckduckgo_search not installed",
+)
+requires_wikipedia = pytest.mark.skipif(
+    importlib.util.find_spec("wikipedia") is None,
+    reason="wikipedia not installed",
+)
+
+
+@pytest.fixture(scope="module")
+def ddgs():
+    # One client per module so searches reuse its HTTP session
+    from duckduckgo_search import DDGS
+    return DDGS()
+
+
+class TestSetupSmoke:
+    def test_hub_tools_listed(self) -> None:
+        tools = LangChainHubLoader.list_available_tools()
+        assert tools
+        for tool in tools:
+            info = LangChainHubLoader.get_tool_info(tool)
+            assert info is not None
+            assert "requires_api_key" in info
+
+    @pytest.mark.integration
+    @requires_ddgs
+    def test_duckduckgo_direct(self, ddgs) -> None:
+        results = list(ddgs.text("Python programming language", max_results=2))
+        assert len(results) <= 2
+
+    @pytest.mark.integration
+    @requires_wikipedia
+    def test_wikipedia_direct(self) -> None:
+        import wikipedia
+
+        wikipedia.set_lang("en")
+        summary = wikipedia.summary("Python (programming language)", sentences=2)
+        assert summary
+
+    def test_custom_leaf_creation(self) -> None:
+        async def my_search(query: str, **kwargs):
+            return {"query": query}
+
+        leaf = Leaf(
+            name="custom_search",
+            tool_func=my_search,
+            description="Custom DuckDuckGo search without LangChain wrapper",
+        )
+        assert leaf.name == "custom_search"
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @requires_ddgs
+    async def test_custom_leaf_execution(self, ddgs) -> None:
+        async def my_search(query: str, **kwargs):
+            results = list(ddgs.text(query, max_results=3))
+            return {"query": query, "count": len(results), "results": results}
+
+        leaf = Leaf(
+            name="custom_search",
+            tool_func=my_search,
+            description="Custom DuckDuckGo search without LangChain wrapper",
+        )
+        result = await leaf.execute("OpenAspen AI framework")
+
+        assert result["success"] is True
+        assert result["result"]["count"] == len(result["result"]["results"])
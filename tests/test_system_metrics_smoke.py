@@ -0,0 +1,17 @@
+import pytest
+from openaspen.skills.system_monitor import SystemMonitor, check_system_alerts
+
+
+class TestSystemMetricsSmoke:
+    def test_format_report_for_llm(self) -> None:
+        report = SystemMonitor.format_report_for_llm()
+        assert isinstance(report, str)
+        assert report
+
+    @pytest.mark.asyncio
+    async def test_check_system_alerts(self) -> None:
+        alerts = await check_system_alerts()
+        assert alerts["status"]
+        assert alerts["alert_count"] == len(alerts["alerts"])
+        for alert in alerts["alerts"]:
+            assert {"level", "component", "message"} <= alert.keys()
@@ -1,6 +1,9 @@
+import asyncio
 import pytest
+from unittest.mock import AsyncMock, patch
 from openaspen import OpenAspenTree
-from openaspen.llm.providers import create_llm_config
+from openaspen.core.branch import Branch
+from openaspen.llm.providers import LLMConfig
 
 
 async def test_tool(input_data: str) -> str:
@@ -8,88 +11,80 @@ async def test_tool(input_data: str) -> str:
 
 
 class TestOpenAspenTree:
-    def test_tree_creation(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs, name="TestTree")
+    def test_tree_creation(self, openai_config: LLMConfig) -> None:
+        tree = OpenAspenTree(llm_configs={"openai": openai_config}, name="TestTree")
         assert tree.name == "TestTree"
         assert len(tree.branches) == 0
 
-    def test_add_branch(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs)
-        branch = tree.add_branch("test_branch", description="Test")
+    def test_add_branch(self, fresh_tree: OpenAspenTree) -> None:
+        branch = fresh_tree.add_branch("test_branch", description="Test")
 
-        assert len(tree.branches) == 1
+        assert len(fresh_tree.branches) == 1
         assert branch.name == "test_branch"
 
-    def test_grow_branch(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs)
-        branch = tree.grow_branch("test_branch")
+    def test_grow_branch(self, fresh_tree: OpenAspenTree) -> None:
+        branch = fresh_tree.grow_branch("test_branch")
 
-        assert len(tree.branches) == 1
+        assert len(fresh_tree.branches) == 1
         assert branch.name == "test_branch"
 
     @pytest.mark.asyncio
-    async def test_spawn_leaf(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs)
-        branch = tree.add_branch("test_branch")
+    async def test_spawn_leaf(self, fresh_tree: OpenAspenTree) -> None:
+        branch = fresh_tree.add_branch("test_branch")
 
-        leaf = await tree.spawn_leaf(branch, "test_leaf", test_tool, "Test tool")
+        leaf = await fresh_tree.spawn_leaf(branch, "test_leaf", test_tool, "Test tool")
 
         assert leaf.name == "test_leaf"
         assert len(branch.children) == 1
 
-    def test_get_branch(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs)
-        tree.add_branch("branch1")
-        tree.add_branch("branch2")
+    @pytest.mark.asyncio
+    async def test_spawn_leaves_index_in_one_batch(self, fresh_tree: OpenAspenTree) -> None:
+        branch = fresh_tree.add_branch("test_branch")
+        manager = fresh_tree.embedding_manager
+
+        calls = []
+        embed_documents = manager.embed_documents
+
+        async def counting_embed(texts, *args, **kwargs):
+            calls.append(len(texts))
+            return await embed_documents(texts, *args, **kwargs)
 
-        found = tree.get_branch("branch2")
+        manager.embed_documents = counting_embed
+        await asyncio.gather(
+            *(fresh_tree.spawn_leaf(branch, f"leaf{i}", test_tool, f"Tool {i}") for i in range(3))
+        )
+        await fresh_tree.wait_indexed()
+
+        assert calls == [3]
+        assert fresh_tree.shared_rag_db.get_stats()["total_documents"] == 3
+
+    def test_get_branch(self, fresh_tree: OpenAspenTree) -> None:
+        fresh_tree.add_branch("branch1")
+        fresh_tree.add_branch("branch2")
+
+        found = fresh_tree.get_branch("branch2")
         assert found is not None
         assert found.name == "branch2"
 
-    def test_remove_branch(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs)
-        tree.add_branch("branch1")
-        tree.add_branch("branch2")
+    def test_remove_branch(self, fresh_tree: OpenAspenTree) -> None:
+        fresh_tree.add_branch("branch1")
+        fresh_tree.add_branch("branch2")
 
-        removed = tree.remove_branch("branch1")
+        removed = fresh_tree.remove_branch("branch1")
         assert removed is True
-        assert len(tree.branches) == 1
-        assert tree.get_branch("branch1") is None
-
-    def test_visualize(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs, name="TestTree")
+        assert len(fresh_tree.branches) == 1
+        assert fresh_tree.get_branch("branch1") is None
+
+    def test_visualize(self, openai_config: LLMConfig) -> None:
+        tree = OpenAspenTree(llm_configs={"openai": openai_config}, name="TestTree")
         branch = tree.add_branch("test_branch")
 
         viz = tree.visualize()
         assert "TestTree" in viz
         assert "test_branch" in viz
 
-    def test_to_dict(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs, name="TestTree")
+    def test_to_dict(self, openai_config: LLMConfig) -> None:
+        tree = OpenAspenTree(llm_configs={"openai": openai_config}, name="TestTree")
         tree.add_branch("branch1", description="First branch")
 
         tree_dict = tree.to_dict()
@@ -97,17 +92,38 @@ class TestOpenAspenTree:
         assert len(tree_dict["branches"]) == 1
         assert tree_dict["branches"][0]["name"] == "branch1"
 
-    def test_execution_history(self) -> None:
-        configs = {
-            "openai": create_llm_config(provider="openai", api_key="test"),
-        }
-        tree = OpenAspenTree(llm_configs=configs)
+    def test_execution_history(self, fresh_tree: OpenAspenTree) -> None:
+        fresh_tree._execution_history.append({"query": "test1", "result": "result1"})
+        fresh_tree._execution_history.append({"query": "test2", "result": "result2"})
 
-        tree._execution_history.append({"query": "test1", "result": "result1"})
-        tree._execution_history.append({"query": "test2", "result": "result2"})
-
-        history = tree.get_execution_history(limit=5)
+        history = fresh_tree.get_execution_history(limit=5)
         assert len(history) == 2
 
-        tree.clear_history()
-        assert len(tree.get_execution_history()) == 0
+        fresh_tree.clear_history()
+        assert len(fresh_tree.get_execution_history()) == 0
+
+    def test_execution_history_bounded(self, openai_config: LLMConfig) -> None:
+        tree = OpenAspenTree(llm_configs={"openai": openai_config}, history_max=3)
+
+        for i in range(5):
+            tree._execution_history.append({"query": f"test{i}", "result": i})
+
+        history = tree.get_execution_history(limit=10)
+        assert [record["result"] for record in history] == [2, 3, 4]
+        assert [record["result"] for record in tree.get_execution_history(limit=2)] == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_execute_cache_hit(self, openai_config: LLMConfig) -> None:
+        tree = OpenAspenTree(llm_configs={"openai": openai_config}, response_cache_threshold=0.95)
+        tree.add_branch("branch1")
+
+        branch_execute = AsyncMock(return_value={"success": True, "answer": "42"})
+        with patch.object(Branch, "execute", branch_execute):
+            first = await tree.execute("What is the answer?")
+            second = await tree.execute("What is the answer?")
+
+        assert first == second == {"success": True, "answer": "42"}
+        branch_execute.assert_awaited_once()
+        history = tree.get_execution_history()
+        assert len(history) == 2
+        assert history[-1]["cache"] is True